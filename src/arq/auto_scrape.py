@@ -1,10 +1,19 @@
+import asyncio
 from datetime import datetime, timedelta, timezone
 from src.events.service import extract_events_details_from_links
 from src.events.utils import process_csv_file
+from src.logging import logger
 
 RUN_INTERVAL_DAYS = 30
 CSV_FILE_PATH = "uploads/links.csv"
 
+# (process_csv_file result key, ARQ job, label for logs)
+SCRAPE_JOBS = (
+    ("events_list", "extract_events_list", "event"),
+    ("festivals_list", "extract_festivals_links_list", "festival"),
+    ("sports_list", "extract_sports_links_list", "sport"),
+)
+
 
 async def auto_scrape(ctx):
     """
@@ -17,27 +26,29 @@ async def auto_scrape(ctx):
     result = await process_csv_file(CSV_FILE_PATH)
 
     if not result["success"]:
-        print(f"❌ Auto-scrape failed: {result.get('error', 'Unknown error')}")
+        logger.error(f"[ARQ] Auto-scrape failed: {result.get('error', 'Unknown error')}")
         return {
             "status": "failed",
             "run_time": current_time.isoformat(),
             "error": result.get('error', 'Unknown error')
         }
 
-    if len(result["events_list"]) > 0:
-        await extract_events_details_from_links(urls=result["events_list"], job_type='extract_events_list')
-        jobs_queued += len(result["events_list"])
-        print(f"✓ Queued {len(result['events_list'])} event URLs")
+    # Drop duplicate URLs (order preserved) before spending Firecrawl calls on them
+    for list_key, _, _ in SCRAPE_JOBS:
+        result[list_key] = list(dict.fromkeys(result[list_key]))
 
-    if len(result["festivals_list"]) > 0:
-        await extract_events_details_from_links(urls=result["festivals_list"], job_type='extract_festivals_links_list')
-        jobs_queued += len(result["festivals_list"])
-        print(f"✓ Queued {len(result['festivals_list'])} festival URLs")
+    # The three lists are independent, so enqueue them concurrently
+    scheduled = [(list_key, job_type, label) for list_key, job_type, label in SCRAPE_JOBS
+                 if len(result[list_key]) > 0]
+    await asyncio.gather(*(
+        extract_events_details_from_links(urls=result[list_key], job_type=job_type)
+        for list_key, job_type, _ in scheduled
+    ))
 
-    if len(result["sports_list"]) > 0:
-        await extract_events_details_from_links(urls=result["sports_list"], job_type='extract_sports_links_list')
-        jobs_queued += len(result["sports_list"])
-        print(f"✓ Queued {len(result['sports_list'])} sport URLs")
+    jobs_queued = 0
+    for list_key, _, label in scheduled:
+        jobs_queued += len(result[list_key])
+        logger.info(f"[ARQ] Auto-scrape queued {len(result[list_key])} {label} URLs")
 
     return {
         "status": "completed",
@@ -45,5 +56,6 @@ async def auto_scrape(ctx):
         "next_run": (current_time + timedelta(days=RUN_INTERVAL_DAYS)).isoformat(),
         "events": len(result["events_list"]),
         "festivals": len(result["festivals_list"]),
-        "sports": len(result["sports_list"])
+        "sports": len(result["sports_list"]),
+        "jobs_queued": jobs_queued
     }
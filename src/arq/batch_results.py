@@ -0,0 +1,86 @@
+"""
+Batch Results - ARQ Helpers
+
+Runs a Firecrawl batch scrape and yields its documents page by page, so a
+large batch never has to be held in memory as one list.
+"""
+
+import asyncio
+from typing import AsyncIterator, List, Optional
+from firecrawl.v2.types import Document, PaginationConfig
+from firecrawl.v2.utils.error_handler import handle_response_error
+from firecrawl.v2.utils.normalize import normalize_document_input
+from src.firecrawl.core import firecrawl_async
+from src.exceptions import FirecrawlError, FirecrawlTimeoutError
+from src.logging import logger
+
+# Only the first results page comes back with each status poll; the rest are
+# fetched once the job is done, one page at a time
+_FIRST_PAGE_ONLY = PaginationConfig(auto_paginate=False)
+
+
+async def iter_batch_scrape(
+    urls: List[str],
+    poll_interval: int = 2,
+    wait_timeout: Optional[float] = None,
+    **kwargs
+) -> AsyncIterator[Document]:
+    """
+    Start a batch scrape and yield its documents as each results page arrives
+
+    AsyncFirecrawl.batch_scrape follows every `next` link on every status poll
+    and returns all documents at once. This polls the first page only and
+    then walks the remaining pages, so only one page is resident at a time.
+
+    Args:
+        urls: URLs to scrape
+        poll_interval: Seconds between status polls
+        wait_timeout: Seconds to wait for the job to finish (None waits forever)
+        **kwargs: Passed to start_batch_scrape (options=ScrapeOptions(...), ...)
+
+    Yields:
+        Document: One scraped page, in the order Firecrawl returns them
+
+    Raises:
+        FirecrawlTimeoutError: If the job doesn't finish within wait_timeout
+            (the job is cancelled first so it stops using credits)
+    """
+    client = firecrawl_async._v2_client
+    job = await client.start_batch_scrape(urls, **kwargs)
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait_timeout if wait_timeout else None
+    while True:
+        status = await client.get_batch_scrape_status(job.id, pagination_config=_FIRST_PAGE_ONLY)
+        if status.status in ("completed", "failed", "cancelled"):
+            break
+        if deadline and loop.time() > deadline:
+            await _cancel_batch_scrape(client, job.id)
+            raise FirecrawlTimeoutError(f"Batch scrape {job.id} timed out after {wait_timeout}s")
+        await asyncio.sleep(poll_interval)
+
+    for doc in status.data:
+        yield doc
+    next_url = status.next
+    del status
+
+    http = client.async_http_client
+    while next_url:
+        response = await http.get(next_url)
+        if response.status_code >= 400:
+            handle_response_error(response, "get batch scrape page")
+        page = response.json()
+        if not page.get("success"):
+            raise FirecrawlError(page.get("error", "Failed to fetch batch scrape page"))
+        next_url = page.get("next")
+        for doc in page.get("data") or []:
+            if isinstance(doc, dict):
+                yield Document(**normalize_document_input(doc))
+
+
+async def _cancel_batch_scrape(client, job_id: str):
+    """Cancel a batch job we stopped waiting for (best effort)"""
+    try:
+        await client.cancel_batch_scrape(job_id)
+    except Exception as exc:
+        logger.warning(f"[ARQ] Failed to cancel batch scrape {job_id}: {exc}")
@@ -2,16 +2,18 @@
 Batch Scrape Event Details - ARQ Task
 
 Extracts structured data from multiple event detail pages in a single
-batch operation using Firecrawl's extract API.
+Firecrawl batch_scrape call with a JSON format.
 """
 
-import json
 import asyncio
+import orjson
 from typing import List
-from src.firecrawl.core import firecrawl_async
-from src.database.core import redis_client
+from firecrawl.v2.types import ScrapeOptions
+from pydantic import TypeAdapter, ValidationError
+from src.database.core import redis_async
 from src.logging import logger
-from src.events.schemas import EVENT_DETAILS_SCHEMA
+from src.config import settings
+from src.events.schemas import EVENT_DETAILS_SCHEMA, StoredEvent
 from src.exceptions import (
     FirecrawlError,
     FirecrawlTimeoutError,
@@ -19,6 +21,51 @@ from src.exceptions import (
     handle_firecrawl_error
 )
 from src.arq.calculate_timeout import calculatedTimeout
+from src.arq.retry import job_retry_count, retry_with_backoff
+from src.arq.link_tracking import unprocessed_links
+from src.arq.batch_results import iter_batch_scrape
+
+
+_EVENT_DETAILS_OPTIONS = ScrapeOptions(formats=[{
+    'type': 'json',
+    'schema': EVENT_DETAILS_SCHEMA,
+    'prompt': '''Extract detailed information for each event from these event pages.
+    For each event, extract:
+    - Title (event name)
+    - Description (full event description)
+    - Event link (URL to the event page)
+    - Location (venue/address if available)
+    - Date (event date/time if available)
+    - Registration link (if available)
+    - Contact information (email/phone if available)
+
+    If any field is not found, use empty string.
+    Return an array of event objects.'''
+}])
+
+# Validates a whole batch of extracted events in one pass
+_STORED_EVENTS = TypeAdapter(List[StoredEvent])
+
+
+def _valid_events(events: list) -> list:
+    """
+    Drop events missing a required field, validating the batch in one call
+
+    Returns:
+        list: The events (as extracted) that passed validation
+    """
+    try:
+        _STORED_EVENTS.validate_python(events)
+    except ValidationError as exc:
+        # Errors are located as (event index, field, ...)
+        invalid = {error['loc'][0] for error in exc.errors() if error['loc']}
+    else:
+        return events
+
+    for idx in sorted(invalid):
+        logger.warning(
+            f"Skipping event with missing required fields: {events[idx]}")
+    return [event for idx, event in enumerate(events) if idx not in invalid]
 
 
 async def batch_scrape_event_details(ctx, urls: List[str], retry_count: int = 0):
@@ -26,7 +73,7 @@ async def batch_scrape_event_details(ctx, urls: List[str], retry_count: int = 0)
     Batch scrape event detail pages and extract structured data.
 
     This function processes multiple event detail URLs in a single batch,
-    extracting structured event information using Firecrawl's extract API.
+    extracting structured event information with a Firecrawl JSON format.
 
     Args:
         ctx: ARQ context with Redis connection
@@ -44,45 +91,44 @@ async def batch_scrape_event_details(ctx, urls: List[str], retry_count: int = 0)
     redis = ctx['redis']
     rate_limiter = ctx.get('rate_limiter')
 
+    # ARQ re-runs a job with the same arguments, so count attempts from job_try
+    retry_count = job_retry_count(ctx, retry_count)
+
     # Progressive timeout strategy
-    timeout = calculatedTimeout(retry_count, base_timeout=180)
+    timeout = calculatedTimeout(retry_count)
+
+    # Don't spend Firecrawl credits on pages that were already processed
+    requested = len(urls)
+    urls = await unprocessed_links(settings.redis_processed_event_links_key, urls)
+    if not urls:
+        logger.info(f"All {requested} event detail URLs already processed, skipping batch")
+        return {
+            'success': True,
+            'urls_processed': 0,
+            'urls_skipped': requested,
+            'events_extracted': 0,
+            'events_stored': 0,
+            'method': 'batch'
+        }
 
     logger.info(
-        f"Batch extracting {len(urls)} event details (attempt {retry_count + 1}/4, timeout: {timeout}s)")
+        f"Batch extracting {len(urls)} event details (attempt {retry_count + 1}/4, timeout: {timeout // 1000}s)")
 
     try:
         # Rate limiting - CRITICAL
         if rate_limiter:
             await rate_limiter.acquire()
 
-        # Extract structured data from batch of URLs
-        extraction_result = await firecrawl_async.batch_scrape(
-            urls=urls,
-            params={
-                'schema': EVENT_DETAILS_SCHEMA,
-                'prompt': '''Extract detailed information for each event from these event pages.
-                For each event, extract:
-                - Title (event name)
-                - Description (full event description)
-                - Event link (URL to the event page)
-                - Location (venue/address if available)
-                - Date (event date/time if available)
-                - Registration link (if available)
-                - Contact information (email/phone if available)
-
-                If any field is not found, use empty string.
-                Return an array of event objects.'''
-            }
-        )
-
-        if not extraction_result or not isinstance(extraction_result, dict):
-            logger.error(f"Invalid extraction result: {extraction_result}")
-            raise FirecrawlError("Invalid response from extract API")
-
-        # Process extracted events
-        events_data = extraction_result.get('data', {})
-        events = events_data.get('events', []) if isinstance(
-            events_data, dict) else []
+        # Extract structured data from the batch of URLs, page by page
+        events = []
+        async for document in iter_batch_scrape(
+            urls,
+            options=_EVENT_DETAILS_OPTIONS,
+            poll_interval=2,
+            wait_timeout=timeout / 1000
+        ):
+            if document.json:
+                events.extend(document.json.get('events') or [])
 
         if not events:
             logger.warning(f"No events extracted from {len(urls)} URLs")
@@ -94,24 +140,16 @@ async def batch_scrape_event_details(ctx, urls: List[str], retry_count: int = 0)
                 'method': 'batch'
             }
 
-        # Store events in Redis
+        # Validate required fields once for the batch, then store with a single RPUSH
+        payloads = [orjson.dumps(event) for event in _valid_events(events)]
+
         stored_count = 0
-        for event in events:
+        if payloads:
             try:
-                # Validate required fields
-                if not event.get('title') or not event.get('event_link'):
-                    logger.warning(
-                        f"Skipping event with missing required fields: {event}")
-                    continue
-
-                # Store in Redis list
-                event_json = json.dumps(event)
-                redis_client.rpush('events_details', event_json)
-                stored_count += 1
-
+                await redis_async.rpush(settings.redis_events_detail_key, *payloads)
+                stored_count = len(payloads)
             except Exception as e:
-                logger.error(f"Error storing event: {str(e)}")
-                continue
+                logger.error(f"Error storing {len(payloads)} events: {str(e)}")
 
         result_summary = {
             'success': True,
@@ -125,32 +163,35 @@ async def batch_scrape_event_details(ctx, urls: List[str], retry_count: int = 0)
         logger.info(f"Batch extraction complete: {result_summary}")
         return result_summary
 
-    except asyncio.TimeoutError:
-        error_msg = f"Batch extraction timed out after {timeout}s"
+    except (asyncio.TimeoutError, FirecrawlTimeoutError):
+        error_msg = f"Batch extraction timed out after {timeout // 1000}s"
         logger.error(error_msg)
 
         if retry_count < 3:
-            delay = 60 * (2 ** retry_count)
+            retry = retry_with_backoff(retry_count)
             logger.info(
-                f"Retrying in {delay}s... (attempt {retry_count + 2}/4)")
-            await asyncio.sleep(delay)
-            raise asyncio.CancelledError()
+                f"Retrying in {retry.defer_score // 1000}s... (attempt {retry_count + 2}/4)")
+            raise retry
         else:
             raise FirecrawlTimeoutError(error_msg)
 
+    except FirecrawlError:
+        # Already classified, don't re-match it by message
+        raise
+
     except Exception as exc:
         logger.error(f"Batch extraction error: {str(exc)}")
 
         # Categorize error
-        if "timeout" in str(exc).lower():
+        error_msg = str(exc).lower()
+        if "timeout" in error_msg:
             if retry_count < 3:
-                delay = 60 * (2 ** retry_count)
-                logger.info(f"Timeout error, retrying in {delay}s...")
-                await asyncio.sleep(delay)
-                raise asyncio.CancelledError()
+                retry = retry_with_backoff(retry_count)
+                logger.info(f"Timeout error, retrying in {retry.defer_score // 1000}s...")
+                raise retry from exc
             raise FirecrawlTimeoutError(
                 f"Batch extraction timeout: {str(exc)}")
-        elif "rate limit" in str(exc).lower():
+        elif "rate limit" in error_msg:
             raise FirecrawlRateLimitError(f"Rate limit exceeded: {str(exc)}")
         else:
             handle_firecrawl_error(exc)
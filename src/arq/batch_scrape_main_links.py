@@ -5,21 +5,44 @@ Scrapes multiple main event page URLs using Firecrawl's batch_scrape API.
 This is significantly faster than scraping URLs one by one.
 """
 
-import asyncio
 from typing import List
-from src.firecrawl.core import firecrawl_async
+from firecrawl.v2.types import ScrapeOptions
 from src.logging import logger
-from src.database.core import redis_client
+from src.database.core import redis_async
 from src.config import settings
 from src.exceptions import (
-    FirecrawlError,
     FirecrawlTimeoutError,
     FirecrawlRateLimitError,
     FirecrawlCreditError,
     handle_firecrawl_error
 )
 from src.arq.calculate_timeout import calculatedTimeout
-from src.events.schemas import MainLinkSchema
+from src.arq.retry import job_retry_count, retry_with_backoff
+from src.arq.link_tracking import enqueue_new_links
+from src.arq.batch_results import iter_batch_scrape
+from src.events.schemas import MAIN_LINK_JSON_SCHEMA
+
+
+_MAIN_LINKS_OPTIONS = ScrapeOptions(formats=[{
+    "type": "json",
+    "schema": MAIN_LINK_JSON_SCHEMA,
+    "prompt": """Extract ONLY the direct links to individual event pages or event popup/modal triggers.
+        Include:
+        - Links that lead to specific event details pages
+        - Links that open event popups or modals with event details (these may have anchors like #calendar-xxx-event-xxx)
+        - Links to event registration pages
+        - Any clickable URLs that display information about a single, specific event
+
+        Exclude:
+        - Navigation links (menus, headers, footers)
+        - Social media links
+        - General category or filter pages
+        - Login/signup links
+        - Contact or about us pages
+        - Any other non-event URLs
+
+        Each link should point to or trigger the display of a single, specific event."""
+}, "markdown"], only_main_content=True)
 
 
 async def batch_scrape_main_links(ctx, urls: List[str], retry_count: int = 0):
@@ -45,11 +68,14 @@ async def batch_scrape_main_links(ctx, urls: List[str], retry_count: int = 0):
     redis = ctx['redis']
     rate_limiter = ctx.get('rate_limiter')
 
+    # ARQ re-runs a job with the same arguments, so count attempts from job_try
+    retry_count = job_retry_count(ctx, retry_count)
+
     # Progressive timeout strategy (batch operations need more time)
-    timeout = calculatedTimeout(retry_count, base_timeout=240)
+    timeout = calculatedTimeout(retry_count)
 
     logger.info(
-        f"[ARQ] Batch scraping {len(urls)} URLs (attempt {retry_count + 1}/4, timeout: {timeout}s)")
+        f"[ARQ] Batch scraping {len(urls)} URLs (attempt {retry_count + 1}/4, timeout: {timeout // 1000}s)")
 
     try:
         # 🔥 RATE LIMITING: Wait for our turn to make batch API request
@@ -58,48 +84,25 @@ async def batch_scrape_main_links(ctx, urls: List[str], retry_count: int = 0):
 
         logger.info(f"[ARQ] Initiating batch_scrape for {len(urls)} URLs...")
 
-        # Use AsyncFirecrawl batch_scrape - Single API call for all URLs
-        batch_job = await firecrawl_async.batch_scrape(
-            urls=urls,
-            formats=[{
-                "type": "json",
-                "schema": MainLinkSchema,
-                "prompt": """Extract ONLY the direct links to individual event pages or event popup/modal triggers.
-                    Include:
-                    - Links that lead to specific event details pages
-                    - Links that open event popups or modals with event details (these may have anchors like #calendar-xxx-event-xxx)
-                    - Links to event registration pages
-                    - Any clickable URLs that display information about a single, specific event
-
-                    Exclude:
-                    - Navigation links (menus, headers, footers)
-                    - Social media links
-                    - General category or filter pages
-                    - Login/signup links
-                    - Contact or about us pages
-                    - Any other non-event URLs
-
-                    Each link should point to or trigger the display of a single, specific event."""
-            }, "markdown"],
-            poll_interval=2,
-            wait_timeout=timeout
-        )
-
-        # Check if batch job completed successfully
-        if not batch_job or not hasattr(batch_job, 'data'):
-            logger.error(f"[ARQ] Invalid batch job result: {batch_job}")
-            raise FirecrawlError("Invalid response from batch_scrape API")
-
-        logger.info(f"[ARQ] Batch scrape completed. Processing {len(batch_job.data)} results...")
-
         # Process batch results
         total_events = 0
         urls_processed = 0
         urls_failed = 0
 
-        # batch_job.data contains list of results for each URL
-        for idx, result in enumerate(batch_job.data):
-            url = urls[idx] if idx < len(urls) else 'unknown'
+        # Single batch job for all URLs, links extracted by the JSON format in
+        # the same call; results are handled page by page as they are fetched
+        # instead of materialising the whole batch
+        results_count = 0
+        async for result in iter_batch_scrape(
+            urls,
+            options=_MAIN_LINKS_OPTIONS.model_copy(update={'timeout': timeout}),
+            poll_interval=2,
+            wait_timeout=timeout / 1000
+        ):
+            results_count += 1
+            # Batch pages don't keep request order, so name the page by the URL it echoes
+            metadata = getattr(result, 'metadata', None)
+            url = (metadata.source_url if metadata else None) or 'unknown'
 
             try:
                 # Check if this URL's scrape was successful
@@ -116,20 +119,17 @@ async def batch_scrape_main_links(ctx, urls: List[str], retry_count: int = 0):
 
                 # Extract event links from the JSON format result
                 if hasattr(result, 'json') and result.json:
-                    events_links = result.json.get('event_links', [])
-                    unique_links = 0
-
-                    for link in events_links:
-                        # Check if link already exists in processed set
-                        if not redis_client.sismember(settings.redis_processed_links_key, link):
-                            # Add to queue for processing
-                            redis_client.sadd(settings.redis_event_links_queue_key, link)
-                            unique_links += 1
-
-                            # Queue event details extraction
-                            await redis.enqueue_job('get_event_details', link)
-                        else:
-                            logger.debug(f"[ARQ] Link already processed: {link}")
+                    events_links = result.json.get('links', [])
+
+                    # Dedup against processed links and queue detail extraction
+                    new_links = await enqueue_new_links(
+                        redis,
+                        events_links,
+                        processed_key=settings.redis_processed_event_links_key,
+                        queue_key=settings.redis_event_links_queue_key,
+                        job_name='get_event_details'
+                    )
+                    unique_links = len(new_links)
 
                     logger.info(
                         f"[ARQ] Extracted {len(events_links)} links ({unique_links} new) from {url}")
@@ -145,6 +145,8 @@ async def batch_scrape_main_links(ctx, urls: List[str], retry_count: int = 0):
                 urls_failed += 1
                 continue
 
+        logger.info(f"[ARQ] Batch scrape completed. Processed {results_count} results")
+
         # Return summary
         result_summary = {
             'success': True,
@@ -159,25 +161,22 @@ async def batch_scrape_main_links(ctx, urls: List[str], retry_count: int = 0):
         return result_summary
 
     except FirecrawlTimeoutError as exc:
-        logger.error(f"[ARQ] Batch scrape timeout after {timeout}s: {exc}")
+        logger.error(f"[ARQ] Batch scrape timeout after {timeout // 1000}s: {exc}")
 
         if retry_count >= 3:
             logger.error(f"[ARQ] Max retries reached for batch. Giving up.")
             # Mark all URLs as failed
-            for url in urls:
-                redis_client.sadd(settings.redis_failed_main_links_key, url)
+            await redis_async.sadd(settings.redis_failed_event_main_links_key, *urls)
             return {"success": False, "error": "timeout_exhausted", "urls": urls}
 
-        # Let ARQ retry
-        raise exc
+        # Let ARQ run it again later (frees the worker slot meanwhile)
+        raise retry_with_backoff(retry_count) from exc
 
     except FirecrawlRateLimitError as exc:
         logger.error(f"[ARQ] Rate limit exceeded for batch: {exc}")
-        logger.error(f"[ARQ] Waiting 10s before retry...")
-        await asyncio.sleep(10)
 
-        # Let ARQ retry
-        raise exc
+        # Let ARQ run it again later (frees the worker slot meanwhile)
+        raise retry_with_backoff(retry_count) from exc
 
     except FirecrawlCreditError as exc:
         logger.critical(f"[ARQ] Credit issue for batch: {exc}")
@@ -187,18 +186,17 @@ async def batch_scrape_main_links(ctx, urls: List[str], retry_count: int = 0):
         logger.error(f"[ARQ] Batch scraping error: {str(exc)}")
 
         # Categorize error
-        if "timeout" in str(exc).lower():
+        error_msg = str(exc).lower()
+        if "timeout" in error_msg:
             if retry_count < 3:
-                delay = 60 * (2 ** retry_count)
-                logger.info(f"[ARQ] Timeout error, retrying in {delay}s...")
-                await asyncio.sleep(delay)
-                raise FirecrawlTimeoutError(f"Batch scrape timeout: {str(exc)}")
+                retry = retry_with_backoff(retry_count)
+                logger.info(f"[ARQ] Timeout error, retrying in {retry.defer_score // 1000}s...")
+                raise retry from exc
             else:
                 # Mark all URLs as failed
-                for url in urls:
-                    redis_client.sadd(settings.redis_failed_main_links_key, url)
+                await redis_async.sadd(settings.redis_failed_event_main_links_key, *urls)
                 raise FirecrawlTimeoutError(f"Batch scrape timeout: {str(exc)}")
-        elif "rate limit" in str(exc).lower():
+        elif "rate limit" in error_msg:
             raise FirecrawlRateLimitError(f"Rate limit exceeded: {str(exc)}")
         else:
             handle_firecrawl_error(exc)
@@ -0,0 +1,54 @@
+"""
+Bloom Filter - ARQ Helpers
+
+Small in-process bloom filter used to remember links a worker has already
+seen, so repeat scrapes can skip the Redis membership check for them.
+"""
+
+import math
+from hashlib import blake2b
+from typing import Iterable, Union
+
+
+class BloomFilter:
+    """
+    Fixed-size bloom filter backed by a bytearray
+
+    Membership checks never give false negatives; false positives happen at
+    roughly error_rate once capacity items have been added.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 1e-4):
+        """
+        Args:
+            capacity: Number of items the filter is sized for
+            error_rate: Target false positive rate at capacity
+        """
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: Union[str, bytes]):
+        """Bit positions for an item (double hashing over one blake2b digest)"""
+        if isinstance(item, str):
+            item = item.encode()
+        digest = blake2b(item, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, item: Union[str, bytes]):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def update(self, items: Iterable[Union[str, bytes]]):
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item: Union[str, bytes]) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def __len__(self) -> int:
+        return self.count
@@ -1,8 +1,44 @@
 # from src.arq.enqueqe_job import enqueue_job
+import asyncio
+from typing import Iterable, List, Optional
+from uuid import uuid4
 from src.logging import logger
 from arq import create_pool
+from arq.connections import ArqRedis
+from arq.constants import job_key_prefix, result_key_prefix
+from arq.jobs import Job, serialize_job
+from arq.utils import timestamp_ms
 from src.bg_jobs.arq_tasks import REDIS_SETTINGS
 
+# Jobs written per pipelined round trip by enqueue_jobs
+_ENQUEUE_CHUNK_SIZE = 500
+
+# Shared ARQ pool, created on first enqueue and reused for every call after
+_pool: Optional[ArqRedis] = None
+_pool_lock = asyncio.Lock()
+
+
+async def _get_pool() -> ArqRedis:
+    """
+    Return the shared ARQ pool, creating it on first use
+    """
+    global _pool
+    if _pool is None:
+        async with _pool_lock:
+            if _pool is None:
+                _pool = await create_pool(REDIS_SETTINGS)
+    return _pool
+
+
+async def close_pool():
+    """
+    Close the shared ARQ pool (called on application shutdown)
+    """
+    global _pool
+    if _pool is not None:
+        await _pool.aclose()
+        _pool = None
+
 
 async def enqueue_job(job_name: str, *args, **kwargs):
     """
@@ -16,7 +52,79 @@ async def enqueue_job(job_name: str, *args, **kwargs):
     Returns:
         Job instance
     """
-    redis = await create_pool(REDIS_SETTINGS)
+    redis = await _get_pool()
     job = await redis.enqueue_job(job_name, *args, **kwargs)
     logger.info(f"[ARQ] Enqueued job {job_name} with ID: {job.job_id}")
     return job
+
+
+async def _enqueue_chunk(redis: ArqRedis, job_name: str, args_list: List[tuple],
+                         job_ids: List[str], check_pending: bool) -> List[Optional[Job]]:
+    if check_pending:
+        async with redis.pipeline(transaction=False) as pipe:
+            for job_id in job_ids:
+                # Same keys as ArqRedis.enqueue_job and link_tracking's enqueue script
+                pipe.exists(job_key_prefix + job_id, result_key_prefix + job_id)
+            pending = await pipe.execute()
+    else:
+        pending = [False] * len(job_ids)
+
+    enqueue_time_ms = timestamp_ms()
+    jobs = []
+    scores = {}
+    async with redis.pipeline(transaction=False) as pipe:
+        for args, job_id, is_pending in zip(args_list, job_ids, pending):
+            if is_pending:
+                jobs.append(None)
+                continue
+            payload = serialize_job(job_name, args, {}, None, enqueue_time_ms,
+                                    serializer=redis.job_serializer)
+            pipe.psetex(job_key_prefix + job_id, redis.expires_extra_ms, payload)
+            scores[job_id] = enqueue_time_ms
+            jobs.append(Job(job_id, redis=redis, _queue_name=redis.default_queue_name,
+                            _deserializer=redis.job_deserializer))
+        if scores:
+            pipe.zadd(redis.default_queue_name, scores)
+            await pipe.execute()
+    return jobs
+
+
+async def enqueue_jobs(job_name: str, args_list: Iterable[tuple],
+                       job_ids: Optional[List[str]] = None) -> List[Optional[Job]]:
+    """
+    Enqueue one job per argument tuple, one pipelined round trip per chunk
+
+    Writes each job the same way ArqRedis.enqueue_job does (job payload +
+    queue entry). Without job_ids the ids are fresh UUIDs, so the WATCH/EXISTS
+    uniqueness check enqueue_job does for every job is skipped. With job_ids,
+    one extra round trip skips the ids whose job is still queued or running
+    or whose result is still kept, like enqueue_job and the link_tracking
+    enqueue script; a racing writer can only rewrite the same job, so no
+    WATCH is needed.
+
+    Args:
+        job_name: Name of the function to call
+        args_list: Positional arguments for each job
+        job_ids: Deterministic job id for each entry of args_list
+
+    Returns:
+        list: Job instances in the order of args_list (None where skipped)
+    """
+    redis = await _get_pool()
+    args_list = list(args_list)
+    if job_ids is None:
+        job_ids = [uuid4().hex for _ in args_list]
+        check_pending = False
+    else:
+        check_pending = True
+
+    jobs = []
+    # Fixed-size chunks keep each pipeline (and its reply buffer) small on huge uploads
+    for start in range(0, len(args_list), _ENQUEUE_CHUNK_SIZE):
+        chunk_args = args_list[start:start + _ENQUEUE_CHUNK_SIZE]
+        chunk_ids = job_ids[start:start + _ENQUEUE_CHUNK_SIZE]
+        jobs.extend(await _enqueue_chunk(redis, job_name, chunk_args, chunk_ids, check_pending))
+
+    queued = sum(job is not None for job in jobs)
+    logger.info(f"[ARQ] Enqueued {queued} {job_name} job(s), {len(jobs) - queued} already pending")
+    return jobs
@@ -1,12 +1,54 @@
-import asyncio
 from src.logging import logger
-from src.events.schemas import MainLinkSchema
-from src.firecrawl.core import firecrawl_async
-from src.database.core import redis_client
+from src.events.schemas import MAIN_LINK_JSON_SCHEMA
+from src.database.core import redis_async
 from src.config import settings
-from src.arq.rate_limiter import FIRECRAWL_RATE_LIMIT, rate_limiter
+from src.arq.rate_limiter import FIRECRAWL_RATE_LIMIT
 from src.exceptions import FirecrawlCreditError, FirecrawlRateLimitError, FirecrawlTimeoutError, handle_firecrawl_error
 from src.arq.calculate_timeout import calculatedTimeout
+from src.arq.retry import job_retry_count, retry_with_backoff
+from src.arq.link_tracking import enqueue_new_links
+from src.arq.firecrawl_batcher import AsyncBatcher
+
+
+_EVENTS_LIST_ACTIONS = [
+    {
+        "type": "scroll",
+        "direction": "down"
+    },
+    {
+        "type": "wait",
+        "milliseconds": 15000
+    }
+]
+
+_EVENTS_LIST_FORMATS = [{
+    "type": "json",
+    "schema": MAIN_LINK_JSON_SCHEMA,
+    "prompt": """
+                You are given a webpage that may contain multiple links related to events.
+
+                Your task:
+                Extract ONLY the URLs that directly lead to **individual event detail pages**.
+
+                Guidelines:
+                ✅ Include links that:
+                - Open pages or popups with detailed information about a single, specific event.
+                - Lead to event registration, booking, or ticket pages for one event.
+                - Contain unique event identifiers (e.g., /events/123, /concert/abc, or #event-456).
+
+                🚫 Exclude links that:
+                - Go to general event listings, calendars, categories, blogs, or "all events" pages.
+                - Lead to past event summaries or unrelated pages.
+                - Only load pagination or “See More” buttons.
+
+                ⚙️ If an event opens in a popup or modal (JavaScript-based), include it.
+
+                🎯 Each URL must correspond to exactly one event.
+            """,
+}]
+
+
+events_batcher = AsyncBatcher('events', actions=_EVENTS_LIST_ACTIONS, formats=_EVENTS_LIST_FORMATS)
 
 
 async def extract_events_list(ctx, url: str, retry_count: int = 0):
@@ -23,75 +65,29 @@ async def extract_events_list(ctx, url: str, retry_count: int = 0):
         dict: Status and count of extracted links
     """
 
+    # ARQ re-runs a job with the same arguments, so count attempts from job_try
+    retry_count = job_retry_count(ctx, retry_count)
     timeout = calculatedTimeout(retry_count=retry_count)
     logger.info(
-        f"[ARQ] Starting async scrape for URL: {url} (attempt {retry_count + 1}, timeout: {timeout}s)")
+        f"[ARQ] Starting async scrape for URL: {url} (attempt {retry_count + 1}, timeout: {timeout // 1000}s)")
 
     try:
-        # 🔥 RATE LIMITING: Wait for our turn to make API request
-        await rate_limiter.acquire()
-        logger.debug(f"[ARQ] Rate limit check passed for {url}")
-
-        # Use AsyncFirecrawl for non-blocking operation
-        result = await firecrawl_async.scrape(
-            url,
-            actions=[
-                {
-                    "type": "scroll",
-                    "direction": "down"
-                },
-                {
-                    "type": "wait",
-                    "milliseconds": 15000
-                }
-            ],
-            formats=[{
-                "type": "json",
-                "schema":  MainLinkSchema,
-                "prompt": """
-                            You are given a webpage that may contain multiple links related to events.
-
-                            Your task:
-                            Extract ONLY the URLs that directly lead to **individual event detail pages**.
-
-                            Guidelines:
-                            ✅ Include links that:
-                            - Open pages or popups with detailed information about a single, specific event.
-                            - Lead to event registration, booking, or ticket pages for one event.
-                            - Contain unique event identifiers (e.g., /events/123, /concert/abc, or #event-456).
-
-                            🚫 Exclude links that:
-                            - Go to general event listings, calendars, categories, blogs, or "all events" pages.
-                            - Lead to past event summaries or unrelated pages.
-                            - Only load pagination or “See More” buttons.
-
-                            ⚙️ If an event opens in a popup or modal (JavaScript-based), include it.
-
-                            🎯 Each URL must correspond to exactly one event.
-                        """,
-            }],
-            timeout=timeout,
-            waitFor=5000
-        )
-
-        if result.metadata.status_code == 200:
-            events_links = result.json.get('links', [])
-            unique_links = 0
-
-            print('events_links', events_links)
+        # Coalesced with concurrent scrapes into one batch_scrape call (rate limited per batch)
+        result = await events_batcher.submit(url, timeout)
 
-            for link in events_links:
-                # Check if link already exists in processed set (use config keys)
-                if not redis_client.sismember(settings.redis_processed_event_links_key, link):
-                    # Add to queue for processing
-                    redis_client.sadd(
-                        settings.redis_event_links_queue_key, link)
-                    unique_links += 1
+        status_code = result.metadata.status_code
+        if status_code == 200:
+            events_links = result.json.get('links', [])
 
-                    # Queue event details extraction
-                    await ctx['redis'].enqueue_job('get_event_details', link)
-                else:
-                    logger.debug(f"[ARQ] Link already processed: {link}")
+            # Dedup against processed links and queue detail extraction (use config keys)
+            new_links = await enqueue_new_links(
+                ctx['redis'],
+                events_links,
+                processed_key=settings.redis_processed_event_links_key,
+                queue_key=settings.redis_event_links_queue_key,
+                job_name='get_event_details'
+            )
+            unique_links = len(new_links)
 
             logger.info(
                 f"[ARQ] Extracted {len(events_links)} links ({unique_links} new) from {url}")
@@ -102,7 +98,6 @@ async def extract_events_list(ctx, url: str, retry_count: int = 0):
                 "unique_links": unique_links
             }
         else:
-            status_code = result.metadata.statusCode
             logger.warning(
                 f"[ARQ] Non-200 status code: {status_code} for {url}")
             return {
@@ -112,16 +107,16 @@ async def extract_events_list(ctx, url: str, retry_count: int = 0):
 
     except FirecrawlTimeoutError as exc:
         logger.warning(
-            f"[ARQ] Timeout scraping {url} after {timeout}s (attempt {retry_count + 1}): {exc}")
+            f"[ARQ] Timeout scraping {url} after {timeout // 1000}s (attempt {retry_count + 1}): {exc}")
 
         # If we've exhausted retries, mark as failed
         if retry_count >= 3:
             logger.error(f"[ARQ] Max retries reached for {url}. Giving up.")
-            redis_client.sadd(settings.redis_failed_event_main_links_key, url)
+            await redis_async.sadd(settings.redis_failed_event_main_links_key, url)
             return {"success": False, "error": "timeout_exhausted", "url": url}
 
-        # Defer retry to ARQ (will automatically retry with backoff)
-        raise exc
+        # Let ARQ run it again later with a longer timeout (frees the worker slot meanwhile)
+        raise retry_with_backoff(retry_count) from exc
 
     except FirecrawlRateLimitError as exc:
         # This should rarely happen now with rate limiter!
@@ -130,11 +125,9 @@ async def extract_events_list(ctx, url: str, retry_count: int = 0):
         logger.error(
             f"[ARQ] Consider reducing FIRECRAWL_RATE_LIMIT (currently: {FIRECRAWL_RATE_LIMIT})")
 
-        # Wait longer before retry (Firecrawl suggests 1s, we'll wait 5s to be safe)
-        await asyncio.sleep(5)
-
-        # Let ARQ retry
-        raise exc
+        # No sleep here: the shared limiter has already halved its in-flight
+        # cap and honours any Retry-After; ARQ runs the job again later
+        raise retry_with_backoff(retry_count) from exc
 
     except FirecrawlCreditError as exc:
         logger.critical(f"[ARQ] Credit issue for {url}: {exc}")
@@ -145,6 +138,6 @@ async def extract_events_list(ctx, url: str, retry_count: int = 0):
         try:
             handle_firecrawl_error(exc)
         except (FirecrawlTimeoutError, FirecrawlRateLimitError) as handled_exc:
-            raise handled_exc
+            raise retry_with_backoff(retry_count) from handled_exc
         # For other errors, let ARQ retry
         raise exc
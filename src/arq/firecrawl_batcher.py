@@ -0,0 +1,184 @@
+"""
+Firecrawl Batcher - ARQ Helpers
+
+Coalesces single-URL scrapes issued concurrently by ARQ tasks into one
+Firecrawl batch_scrape call. Every URL that arrives within a short window
+shares a single API request and a single rate limiter token. Successful
+results are cached in Redis so a URL scraped again soon after costs a GET.
+"""
+
+import asyncio
+import math
+import orjson
+from hashlib import blake2b
+from typing import List, Optional
+from firecrawl.v2.types import Document, ScrapeOptions
+from src.database.core import redis_async
+from src.arq.rate_limiter import rate_limiter
+from src.arq.batch_results import iter_batch_scrape
+from src.config import settings
+from src.exceptions import FirecrawlError, FirecrawlRateLimitError
+from src.logging import logger
+
+
+class AsyncBatcher:
+    """
+    Transparent batching for firecrawl_async.scrape
+
+    Callers await submit(url, timeout) and get back the scraped Document for
+    their URL, exactly as if they had called scrape() themselves. A worker
+    coroutine drains the queue, sending up to max_batch URLs per batch_scrape
+    call and waiting at most max_wait_ms for a batch to fill up. Once
+    max_queue URLs are waiting, submit() rejects new ones with
+    FirecrawlRateLimitError instead of queueing without bound.
+    """
+
+    def __init__(self, name: str, actions: list, formats: list,
+                 max_batch: int = settings.firecrawl_batch_max_size,
+                 max_wait_ms: int = settings.firecrawl_batch_max_wait_ms,
+                 max_queue: int = settings.firecrawl_batch_max_queue):
+        """
+        Args:
+            name: Label used in logs
+            actions: Firecrawl page actions applied to every URL
+            formats: Firecrawl formats applied to every URL
+            max_batch: Max URLs per batch_scrape call
+            max_wait_ms: Max time to wait for a batch to fill up
+            max_queue: Max URLs waiting to be batched
+        """
+        self.name = name
+        self.options = ScrapeOptions(actions=actions, formats=formats)
+        # Cache keys change whenever the actions, formats, schema or prompt do
+        self._cache_prefix = f"fc:scrape:{name}:{blake2b(self.options.model_dump_json().encode(), digest_size=8).hexdigest()}:"
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.max_queue = max_queue
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._flushes = set()
+
+    async def submit(self, url: str, timeout: int):
+        """
+        Scrape a single URL as part of the next batch
+
+        Args:
+            url: Page URL to scrape
+            timeout: Firecrawl scrape timeout in milliseconds
+
+        Returns:
+            Document: Scrape result for this URL
+
+        Raises:
+            FirecrawlRateLimitError: If the batcher's queue is full
+        """
+        if settings.firecrawl_cache_ttl:
+            cached = await redis_async.get(self._cache_key(url))
+            if cached is not None:
+                logger.info(f"[Batcher:{self.name}] Cache hit for {url}")
+                return Document.model_validate(orjson.loads(cached))
+
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((url, timeout, future))
+        except asyncio.QueueFull:
+            raise FirecrawlRateLimitError(
+                f"[Batcher:{self.name}] {self.max_queue} URLs already waiting, rejecting {url}")
+        return await future
+
+    async def _run(self):
+        """Collect queued URLs into batches and send them"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            # Send in the background so the next batch can start filling up
+            flush = asyncio.create_task(self._flush(batch))
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: list):
+        """Send one batch_scrape call and hand each caller its Document"""
+        urls = [url for url, _, _ in batch]
+        # The slowest caller's timeout wins so no caller is cut short
+        timeout = max(timeout for _, timeout, _ in batch)
+        # timeout is per page (ms); Firecrawl only scrapes a few pages of a
+        # batch at once, so the whole job may take several rounds of it
+        wait_timeout = timeout / 1000 * math.ceil(len(urls) / settings.firecrawl_batch_page_concurrency)
+
+        logger.info(f"[Batcher:{self.name}] Sending batch of {len(urls)} URLs")
+
+        try:
+            async with rate_limiter.slot():
+                # Cancels the Firecrawl job if it outlives wait_timeout
+                documents = [document async for document in iter_batch_scrape(
+                    urls,
+                    options=self.options.model_copy(update={'timeout': timeout}),
+                    poll_interval=2,
+                    wait_timeout=wait_timeout
+                )]
+            documents = self._match(urls, documents)
+        except Exception as exc:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for (url, _, future), document in zip(batch, documents):
+            if future.done():
+                continue
+            if document is None:
+                future.set_exception(FirecrawlError(f"No batch result for {url}"))
+            else:
+                future.set_result(document)
+
+        if settings.firecrawl_cache_ttl:
+            await self._cache(urls, documents)
+
+    def _cache_key(self, url: str) -> str:
+        return self._cache_prefix + blake2b(url.encode(), digest_size=16).hexdigest()
+
+    async def _cache(self, urls: List[str], documents: list):
+        """Store the successful results of a batch with one pipelined round trip"""
+        pipe = redis_async.pipeline(transaction=False)
+        for url, document in zip(urls, documents):
+            if document is not None and document.metadata and document.metadata.status_code == 200:
+                pipe.set(
+                    self._cache_key(url),
+                    orjson.dumps(document.model_dump(mode='json', exclude_none=True)),
+                    ex=settings.firecrawl_cache_ttl)
+        if len(pipe):
+            try:
+                await pipe.execute()
+            except Exception as exc:
+                logger.warning(f"[Batcher:{self.name}] Failed to cache batch results: {exc}")
+
+    @staticmethod
+    def _match(urls: List[str], documents: list) -> list:
+        """Line up batch results with the requested URLs"""
+        by_url = {}
+        for document in documents:
+            source_url = document.metadata.source_url if document.metadata else None
+            if source_url:
+                by_url.setdefault(source_url, document)
+
+        # Fall back to position when the API didn't echo the source URL
+        positional = len(documents) == len(urls)
+        return [
+            by_url.get(url.strip(), documents[idx] if positional else None)
+            for idx, url in enumerate(urls)
+        ]
@@ -1,18 +1,37 @@
 import asyncio
-import json
+import orjson
 
 from src.logging import logger
-from src.events.schemas import EventDetailsSchema
-from src.firecrawl.core import firecrawl_async
-from src.database.core import redis_client
+from src.events.schemas import EVENT_DETAILS_JSON_SCHEMA
+from src.database.core import redis_async
 from src.config import settings
-from src.arq.rate_limiter import FIRECRAWL_RATE_LIMIT, rate_limiter
+from src.arq.rate_limiter import FIRECRAWL_RATE_LIMIT
 from src.exceptions import FirecrawlCreditError, FirecrawlRateLimitError, FirecrawlTimeoutError, handle_firecrawl_error
 from src.arq.calculate_timeout import calculatedTimeout
-from src.events.utils import write_events_to_csv
+from src.arq.retry import job_retry_count, retry_with_backoff
+from src.arq.link_tracking import mark_links_processed
+from src.arq.firecrawl_batcher import AsyncBatcher
+from src.events.utils import write_events_to_csv, flush_csv_buffers
 from src.arq.prompts import EventDetailsPrompt
 
 
+_EVENT_DETAILS_ACTIONS = [
+    {
+        "type": "scroll",
+        "direction": "down"
+    }
+]
+
+_EVENT_DETAILS_FORMATS = [{
+    "type": "json",
+    "schema": EVENT_DETAILS_JSON_SCHEMA,
+    "prompt": EventDetailsPrompt
+}]
+
+
+event_details_batcher = AsyncBatcher('event_details', actions=_EVENT_DETAILS_ACTIONS, formats=_EVENT_DETAILS_FORMATS)
+
+
 async def get_event_details(ctx, url: str, retry_count: int = 0):
     """
     Extract event details from a single URL using async Firecrawl
@@ -27,63 +46,43 @@ async def get_event_details(ctx, url: str, retry_count: int = 0):
         dict: Status and event count
     """
 
+    # ARQ re-runs a job with the same arguments, so count attempts from job_try
+    retry_count = job_retry_count(ctx, retry_count)
     timeout = calculatedTimeout(retry_count=retry_count)
 
     logger.info(
-        f"[ARQ] Extracting event details from: {url} (attempt {retry_count + 1}, timeout: {timeout}s)")
+        f"[ARQ] Extracting event details from: {url} (attempt {retry_count + 1}, timeout: {timeout // 1000}s)")
 
     try:
-        # 🔥 RATE LIMITING: Wait for our turn to make API request
-        await rate_limiter.acquire()
-        logger.debug(f"[ARQ] Rate limit check passed for {url}")
-
-        # Use AsyncFirecrawl for non-blocking operation
-        result = await firecrawl_async.scrape(
-            url,
-            actions=[
-                {
-                    "type": "scroll",
-                    "direction": "down"
-                }
-            ],
-            formats=[{
-                "type": "json",
-                "schema":  EventDetailsSchema,
-                "prompt": EventDetailsPrompt
-            }],
-            timeout=timeout
-        )
-
-        if result.metadata.status_code == 200:
+        # Coalesced with concurrent scrapes into one batch_scrape call (rate limited per batch)
+        result = await event_details_batcher.submit(url, timeout)
+
+        status_code = result.metadata.status_code
+        if status_code == 200:
             events_details = result.json.get('events', [])
 
             if events_details:
-                # Convert to string for Redis storage (use config keys)
+                # Encode every detail once for the single RPUSH below
+                payloads = [orjson.dumps(details) for details in events_details]
+
+                # Store all details with one RPUSH, mark URL as processed and
+                # remove it from the queue in one round trip
+                pipe = redis_async.pipeline(transaction=False)
+                pipe.rpush(settings.redis_events_detail_key, *payloads)
+                mark_links_processed(
+                    pipe, settings.redis_processed_event_links_key, url)
+                pipe.srem(settings.redis_event_links_queue_key, url)
+                await pipe.execute()
 
                 for details in events_details:
-                    result_string = json.dumps(details)
-                    redis_client.rpush(
-                        settings.redis_events_detail_key, result_string)
-
-                    # Write to CSV file
-                    # csv_file_path = getattr(
-                    #     settings, 'csv_output_file', 'events.csv')
-                    # write_events_to_csv(details, csv_file_path)
-                    write_events_to_csv(
-                        details, settings.csv_event_output_file)
-
-                    # Mark URL as processed
-                    redis_client.sadd(
-                        settings.redis_processed_event_links_key, url)
-
-                    # Remove from queue
-                    redis_client.srem(
-                        settings.redis_event_links_queue_key, url)
-
-                    event_count = len(events_details) if isinstance(
-                        details, list) else 1
-                    logger.info(
-                        f"[ARQ] Stored {event_count} event(s) from: {url}")
+                    await asyncio.to_thread(
+                        write_events_to_csv, details, settings.csv_event_output_file)
+                # Write the rows now rather than leaving them buffered in memory
+                await asyncio.to_thread(flush_csv_buffers, settings.csv_event_output_file)
+
+                event_count = len(events_details)
+                logger.info(
+                    f"[ARQ] Stored {event_count} event(s) from: {url}")
 
                 return {
                     "success": True,
@@ -92,16 +91,15 @@ async def get_event_details(ctx, url: str, retry_count: int = 0):
             else:
                 logger.warning(f"[ARQ] No event details found at: {url}")
                 # Still mark as processed to avoid retrying
-                redis_client.sadd(
-                    settings.redis_processed_event_links_key, url)
-                redis_client.srem(settings.redis_event_links_queue_key, url)
+                await mark_links_processed(
+                    redis_async, settings.redis_processed_event_links_key, url)
+                await redis_async.srem(settings.redis_event_links_queue_key, url)
 
                 return {
                     "success": True,
                     "event_count": 0
                 }
         else:
-            status_code = result.metadata.statusCode
             logger.warning(
                 f"[ARQ] Non-200 status code: {status_code} for {url}")
             return {
@@ -111,17 +109,20 @@ async def get_event_details(ctx, url: str, retry_count: int = 0):
 
     except FirecrawlTimeoutError as exc:
         logger.warning(
-            f"[ARQ] Timeout extracting details from {url} after {timeout}s (attempt {retry_count + 1}): {exc}")
+            f"[ARQ] Timeout extracting details from {url} after {timeout // 1000}s (attempt {retry_count + 1}): {exc}")
 
         if retry_count >= 3:
             logger.error(f"[ARQ] Max retries reached for {url}. Giving up.")
-            redis_client.sadd(
-                settings.redis_failed_event_detail_links_key, url)
-            redis_client.sadd(settings.redis_processed_event_links_key, url)
-            redis_client.srem(settings.redis_event_links_queue_key, url)
+            # One pipelined round trip
+            pipe = redis_async.pipeline()
+            pipe.sadd(settings.redis_failed_event_detail_links_key, url)
+            mark_links_processed(pipe, settings.redis_processed_event_links_key, url)
+            pipe.srem(settings.redis_event_links_queue_key, url)
+            await pipe.execute()
             return {"success": False, "error": "timeout_exhausted", "url": url}
 
-        raise exc
+        # Let ARQ run it again later with a longer timeout (frees the worker slot meanwhile)
+        raise retry_with_backoff(retry_count) from exc
 
     except FirecrawlRateLimitError as exc:
         # This should rarely happen now with rate limiter!
@@ -130,11 +131,9 @@ async def get_event_details(ctx, url: str, retry_count: int = 0):
         logger.error(
             f"[ARQ] Consider reducing FIRECRAWL_RATE_LIMIT (currently: {FIRECRAWL_RATE_LIMIT})")
 
-        # Wait longer before retry
-        await asyncio.sleep(5)
-
-        # Let ARQ retry
-        raise exc
+        # No sleep here: the shared limiter has already halved its in-flight
+        # cap and honours any Retry-After; ARQ runs the job again later
+        raise retry_with_backoff(retry_count) from exc
 
     except FirecrawlCreditError as exc:
         logger.critical(f"[ARQ] Credit issue for {url}: {exc}")
@@ -146,5 +145,5 @@ async def get_event_details(ctx, url: str, retry_count: int = 0):
         try:
             handle_firecrawl_error(exc)
         except (FirecrawlTimeoutError, FirecrawlRateLimitError) as handled_exc:
-            raise handled_exc
+            raise retry_with_backoff(retry_count) from handled_exc
         raise exc
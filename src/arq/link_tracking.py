@@ -0,0 +1,240 @@
+"""
+Link Tracking - ARQ Helpers
+
+Deduplicates links extracted from main pages against the processed set and
+queues detail extraction for the new ones using as few Redis round trips
+as possible.
+"""
+
+from hashlib import blake2b
+from typing import Dict, List, Optional
+from redis.commands.core import AsyncScript
+from redis.exceptions import ResponseError
+from arq.jobs import serialize_job
+from arq.constants import job_key_prefix, result_key_prefix
+from arq.utils import timestamp_ms
+from src.arq.bloom_filter import BloomFilter
+from src.config import settings
+from src.database.core import redis_async
+from src.logging import logger
+
+# Adds each link to the queue set and, if it has no pending job or kept
+# result, writes its ARQ job the same way ArqRedis.enqueue_job does (job
+# payload + queue entry). Queue set membership alone doesn't skip a link: a
+# detail task that gave up leaves it in the set with no job.
+# Every key touched is declared in KEYS:
+# KEYS[1] = queue set, KEYS[2] = ARQ queue, then (job key, result key) pairs
+# ARGV = score, expires_ms, then (link, job_id, job) triples
+# Returns the 1-based positions of the links that were queued.
+_ENQUEUE_NEW_LINKS_LUA = """
+local queued = {}
+for k = 1, (#ARGV - 2) / 3 do
+    local job_key = KEYS[1 + 2 * k]
+    redis.call('SADD', KEYS[1], ARGV[3 * k])
+    if redis.call('EXISTS', job_key, KEYS[2 + 2 * k]) == 0 then
+        redis.call('PSETEX', job_key, ARGV[2], ARGV[3 * k + 2])
+        redis.call('ZADD', KEYS[2], ARGV[1], ARGV[3 * k + 1])
+        table.insert(queued, k)
+    end
+end
+return queued
+"""
+# Registered on the ARQ connection the jobs are written with (see _enqueue_script)
+_enqueue_new_links_script: Optional[AsyncScript] = None
+
+# Per processed-set bloom filters of links this worker has already seen
+_seen_links: Dict[str, BloomFilter] = {}
+
+# Processed set key -> RedisBloom filter key, for the sets stored as RedisBloom
+# filters (only filled when enabled in settings and the module is loaded)
+_processed_blooms: Dict[str, str] = {}
+
+PROCESSED_LINKS_KEYS = (
+    settings.redis_processed_event_links_key,
+    settings.redis_processed_festival_links_key,
+    settings.redis_processed_sport_links_key,
+)
+
+
+def _seen_filter(processed_key: str) -> BloomFilter:
+    if processed_key not in _seen_links:
+        _seen_links[processed_key] = BloomFilter(
+            settings.link_bloom_capacity, settings.link_bloom_error_rate)
+    return _seen_links[processed_key]
+
+
+def processed_bloom_key(processed_key: str) -> str:
+    """RedisBloom filter key used instead of a processed link set when enabled"""
+    return f"{processed_key}:bloom"
+
+
+async def _reserve_processed_bloom(processed_key: str) -> bool:
+    """
+    Create the RedisBloom filter backing a processed link set
+
+    Returns:
+        bool: True if the filter is usable, False if RedisBloom isn't available
+    """
+    bloom_key = processed_bloom_key(processed_key)
+    try:
+        await redis_async.bf().reserve(
+            bloom_key, settings.redis_bloom_error_rate, settings.redis_bloom_capacity,
+            expansion=settings.redis_bloom_expansion)
+    except ResponseError as exc:
+        if "exists" not in str(exc).lower():
+            logger.warning(
+                f"[ARQ] RedisBloom unavailable ({exc}), keeping {processed_key} as a set")
+            return False
+    _processed_blooms[processed_key] = bloom_key
+    return True
+
+
+async def load_seen_links(ctx):
+    """
+    Seed the bloom filters from the processed link sets (ARQ on_startup hook)
+
+    With redis_bloom_processed_links enabled, also reserves the RedisBloom
+    filters and copies any links still held in the old sets into them.
+    """
+    for processed_key in PROCESSED_LINKS_KEYS:
+        use_bloom = settings.redis_bloom_processed_links and await _reserve_processed_bloom(processed_key)
+        seen = _seen_filter(processed_key)
+        batch = []
+        async for link in redis_async.sscan_iter(processed_key, count=1000):
+            seen.add(link)
+            if use_bloom:
+                batch.append(link)
+                if len(batch) >= 1000:
+                    await redis_async.bf().madd(_processed_blooms[processed_key], *batch)
+                    batch = []
+        if batch:
+            await redis_async.bf().madd(_processed_blooms[processed_key], *batch)
+        logger.info(f"[ARQ] Loaded {len(seen)} processed links from {processed_key}")
+
+
+def mark_links_processed(client, processed_key: str, *links: str):
+    """
+    Add links to a processed link set (SADD, or BF.MADD when it is a RedisBloom filter)
+
+    Args:
+        client: redis_async or a pipeline of it
+        processed_key: Redis set holding already processed links
+        links: Links to mark as processed
+
+    Returns:
+        The client's result: an awaitable for redis_async, the pipeline otherwise
+    """
+    bloom_key = _processed_blooms.get(processed_key)
+    if bloom_key:
+        return client.bf().madd(bloom_key, *links)
+    return client.sadd(processed_key, *links)
+
+
+async def _links_processed(processed_key: str, links: List[str]) -> List[bool]:
+    bloom_key = _processed_blooms.get(processed_key)
+    if bloom_key:
+        return [bool(found) for found in await redis_async.bf().mexists(bloom_key, *links)]
+    return await redis_async.smismember(processed_key, links)
+
+
+async def enqueue_new_links(redis, links: List[str], processed_key: str, queue_key: str, job_name: str) -> List[str]:
+    """
+    Queue detail extraction jobs for links that haven't been processed yet.
+
+    Links this worker has already seen processed are skipped without asking
+    Redis; the rest are checked against the processed set (or its RedisBloom
+    filter).
+
+    Args:
+        redis: ARQ Redis connection (ctx['redis'])
+        links: Links extracted from a main page
+        processed_key: Redis set holding already processed links
+        queue_key: Redis set holding links waiting for detail extraction
+        job_name: ARQ function to enqueue for every new link
+
+    Returns:
+        list: Links that were queued for detail extraction
+    """
+    new_links = await unprocessed_links(processed_key, links)
+    if not new_links:
+        return []
+
+    # Only links confirmed processed go into the bloom filter (see
+    # unprocessed_links), so a link whose detail job fails is queued again
+    return await _enqueue_links(redis, new_links, queue_key, job_name)
+
+
+async def unprocessed_links(processed_key: str, links: List[str]) -> List[str]:
+    """
+    Drop duplicates and already processed links, keeping the original order
+
+    Links already in this worker's bloom filter are dropped without asking
+    Redis; the rest are checked with a single SMISMEMBER (or BF.MEXISTS).
+
+    Args:
+        processed_key: Redis set holding already processed links
+        links: Links to check
+
+    Returns:
+        list: Links not processed yet
+    """
+    seen = _seen_filter(processed_key)
+    candidates = [link for link in dict.fromkeys(links) if link not in seen]
+    if not candidates:
+        return []
+
+    processed = await _links_processed(processed_key, candidates)
+    new_links = []
+    for link, is_processed in zip(candidates, processed):
+        if is_processed:
+            seen.add(link)
+        else:
+            new_links.append(link)
+    return new_links
+
+
+def link_job_id(job_name: str, link: str) -> str:
+    """
+    Deterministic ARQ job id for a link, so the same link maps to the same job
+    on every worker
+    """
+    return f"{job_name}:{blake2b(link.encode(), digest_size=12).hexdigest()}"
+
+
+def _enqueue_script(redis) -> AsyncScript:
+    """The enqueue script registered on the given ARQ connection"""
+    global _enqueue_new_links_script
+    if _enqueue_new_links_script is None or _enqueue_new_links_script.registered_client is not redis:
+        _enqueue_new_links_script = redis.register_script(_ENQUEUE_NEW_LINKS_LUA)
+    return _enqueue_new_links_script
+
+
+async def _enqueue_links(redis, links: List[str], queue_key: str, job_name: str) -> List[str]:
+    """
+    Atomically add links to the queue set and enqueue a job for each one
+    without a pending job, in a single EVALSHA. Job ids are derived from the
+    link, so a link whose job is still pending (or whose result is still
+    kept) is not queued again.
+
+    Args:
+        redis: ARQ Redis connection (runs the script and supplies job
+            serializer, queue name and expiry)
+        links: Links not yet processed
+        queue_key: Redis set holding links waiting for detail extraction
+        job_name: ARQ function to enqueue for every new link
+
+    Returns:
+        list: Links that were queued by this call
+    """
+    enqueue_time_ms = timestamp_ms()
+    keys = [queue_key, redis.default_queue_name]
+    args = [enqueue_time_ms, redis.expires_extra_ms]
+    for link in links:
+        job_id = link_job_id(job_name, link)
+        job = serialize_job(job_name, (link,), {}, None, enqueue_time_ms,
+                            serializer=redis.job_serializer)
+        keys.extend((job_key_prefix + job_id, result_key_prefix + job_id))
+        args.extend((link, job_id, job))
+
+    queued = await _enqueue_script(redis)(keys=keys, args=args)
+    return [links[position - 1] for position in queued]
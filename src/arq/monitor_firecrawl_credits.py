@@ -0,0 +1,34 @@
+from src.logging import logger
+from src.config import settings
+from src.firecrawl.service import get_firecrawl_credits
+
+
+async def monitor_firecrawl_credits(ctx):
+    """
+    Check the remaining Firecrawl credits and log a warning when they run low
+
+    Args:
+        ctx: ARQ context
+
+    Returns:
+        dict: Credits status
+    """
+    data = await get_firecrawl_credits()
+    if not data.get('success'):
+        return {"success": False, "error": data.get('error')}
+
+    credits_remaining = data.get('data', {}).get('remainingCredits', 0)
+
+    if credits_remaining < settings.credits_critical_threshold:
+        logger.critical(
+            f"[ARQ] CRITICAL: Only {credits_remaining} Firecrawl credits remaining!")
+    elif credits_remaining < settings.credits_warning_threshold:
+        logger.warning(
+            f"[ARQ] WARNING: Only {credits_remaining} Firecrawl credits remaining")
+    else:
+        logger.info(f"[ARQ] Firecrawl credits: {credits_remaining}")
+
+    return {
+        "success": True,
+        "credits_remaining": credits_remaining
+    }
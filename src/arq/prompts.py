@@ -1,3 +1,5 @@
+import textwrap
+
 SportsDetailsPrompt = """
                             You are given a webpage containing one or more **sports event listings or detail pages**.
 
@@ -129,3 +131,10 @@ EventDetailsPrompt = """
                             - If a field is missing, omit it or leave it empty — do not guess or fabricate data.
                             - Prioritize accurate details found in the visible content over metadata or summaries.
                         """
+
+
+# Strip the source indentation once at import so each request carries the
+# compact prompt text instead of ~30 leading spaces per line
+SportsDetailsPrompt = textwrap.dedent(SportsDetailsPrompt).strip()
+FestivalDetailsPrompt = textwrap.dedent(FestivalDetailsPrompt).strip()
+EventDetailsPrompt = textwrap.dedent(EventDetailsPrompt).strip()
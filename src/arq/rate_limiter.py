@@ -1,5 +1,6 @@
 import asyncio
 import time
+from contextlib import asynccontextmanager
 from fastapi import HTTPException
 from src.config import settings
 from src.logging import logger
@@ -9,6 +10,70 @@ from src.logging import logger
 # Rate Limiter for Firecrawl API & API Routes
 # ============================================
 
+class AIMDConcurrency:
+    """
+    Adaptive cap on in-flight Firecrawl requests (additive increase,
+    multiplicative decrease)
+
+    The limit grows by `increase` after every request that finishes under
+    target_latency and is halved when Firecrawl answers 429 or 5xx. A
+    Retry-After header on the error also holds back new requests until it
+    has passed.
+    """
+
+    def __init__(self, max_concurrent: int, min_concurrent: int = 1,
+                 target_latency: float = 60.0, increase: float = 0.5):
+        """
+        Args:
+            max_concurrent: Upper bound (and starting value) for the limit
+            min_concurrent: Lower bound for the limit
+            target_latency: Requests slower than this (seconds) don't grow the limit
+            increase: Added to the limit per fast successful request
+        """
+        self.max_limit = max_concurrent
+        self.min_limit = min(min_concurrent, max_concurrent)
+        self.limit = float(max_concurrent)
+        self.target_latency = target_latency
+        self.increase = increase
+        self.in_flight = 0
+        self.resume_at = 0.0  # time.monotonic() before which no request starts
+        self._changed = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+        delay = self.resume_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def release(self):
+        async with self._changed:
+            self.in_flight -= 1
+            self._changed.notify_all()
+
+    def record_success(self, latency: float):
+        if latency < self.target_latency and self.limit < self.max_limit:
+            self.limit = min(float(self.max_limit), self.limit + self.increase)
+
+    def record_failure(self, exc: BaseException):
+        status_code = getattr(exc, 'status_code', None)
+        if status_code is None or (status_code != 429 and status_code < 500):
+            return
+
+        self.limit = max(self.min_limit, self.limit * 0.5)
+
+        response = getattr(exc, 'response', None)
+        retry_after = response.headers.get('retry-after') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            self.resume_at = max(self.resume_at, time.monotonic() + int(retry_after))
+
+        logger.warning(
+            f"[RateLimiter] Firecrawl answered {status_code}, in-flight limit now {int(self.limit)}"
+            + (f", pausing {retry_after}s" if retry_after else ""))
+
+
 class FirecrawlRateLimiter:
     """
     Token bucket rate limiter to prevent "Rate Limit Exceeded" errors
@@ -17,60 +82,93 @@ class FirecrawlRateLimiter:
     This means you're making too many requests per minute!
 
     Solution: Wait between requests to stay under the limit
+
+    The bucket is tracked as a deadline (next_slot_ns, integer nanoseconds
+    on the monotonic clock) instead of a float token count: every request
+    pushes the deadline forward by one interval, and a request only waits
+    once the deadline is more than a full bucket (burst) ahead of now.
     """
 
-    def __init__(self, requests_per_minute: int = 12):
+    def __init__(self, requests_per_minute: int = 12, max_concurrent: int = 5,
+                 min_concurrent: int = 1, target_latency: float = 60.0):
         """
         Args:
             requests_per_minute: Max requests per minute
                 Free/Hobby: 15-20 req/min (use 12 to be safe)
                 Standard: 50-100 req/min
                 Growth: 200+ req/min
+            max_concurrent: Max requests in flight at once
+            min_concurrent: Floor for the in-flight limit after throttling
+            target_latency: Seconds under which a request lets the in-flight limit grow
         """
         self.rate = requests_per_minute
-        self.tokens = requests_per_minute
         self.max_tokens = requests_per_minute
-        self.last_update = time.time()
-        self.lock = asyncio.Lock()
         self.min_interval = 60.0 / requests_per_minute  # Seconds between requests
+        self.interval_ns = 60_000_000_000 // requests_per_minute
+        # How far next_slot_ns may run ahead of now before callers wait (a full bucket)
+        self.burst_ns = (self.max_tokens - 1) * self.interval_ns
+        self.next_slot_ns = time.monotonic_ns()
+        # Bounds in-flight requests; the token bucket only throttles request starts
+        self.inflight = AIMDConcurrency(max_concurrent, min_concurrent, target_latency)
 
         logger.info(
-            f"[RateLimiter] Initialized: {self.rate} requests/minute (~{self.min_interval:.2f}s between requests)")
+            f"[RateLimiter] Initialized: {self.rate} requests/minute (~{self.min_interval:.2f}s between requests), {max_concurrent} in flight")
 
     async def acquire(self):
         """Wait if necessary to respect rate limit"""
-        async with self.lock:
-            now = time.time()
-            time_passed = now - self.last_update
-
-            # Refill tokens based on time passed
-            self.tokens = min(
-                self.max_tokens,
-                self.tokens + time_passed * (self.rate / 60.0)
-            )
-            self.last_update = now
-
-            # Wait if no tokens available
-            if self.tokens < 1:
-                wait_time = (1 - self.tokens) / (self.rate / 60.0)
-                logger.warning(
-                    f"[RateLimiter] Rate limit reached. Waiting {wait_time:.1f}s...")
-                await asyncio.sleep(wait_time)
-                self.tokens = 1
-                self.last_update = time.time()
-
-            # Consume a token
-            self.tokens -= 1
-            remaining_tokens = int(self.tokens)
+        # Reserve a slot, then sleep until it comes up. There is no await
+        # between reading and advancing the deadline, so no lock is needed
+        # (single event loop) and waiters sleep in parallel.
+        now = time.monotonic_ns()
+        slot = max(self.next_slot_ns, now)
+        wait_ns = slot - now - self.burst_ns
+        self.next_slot_ns = slot + self.interval_ns
+
+        if wait_ns > 0:
+            wait_time = wait_ns / 1e9
+            logger.warning(
+                f"[RateLimiter] Rate limit reached. Waiting {wait_time:.1f}s...")
+            await asyncio.sleep(wait_time)
+        else:
+            remaining_tokens = self.max_tokens - (self.next_slot_ns - now + self.interval_ns - 1) // self.interval_ns
             if remaining_tokens <= 3:
                 logger.info(
                     f"[RateLimiter] Low tokens: {remaining_tokens}/{self.max_tokens} remaining")
 
+    @asynccontextmanager
+    async def slot(self):
+        """
+        Hold an in-flight slot and a rate limit token around one Firecrawl call,
+        feeding its outcome back into the adaptive in-flight limit
+
+        Usage:
+            async with rate_limiter.slot():
+                result = await firecrawl_async.scrape(...)
+        """
+        await self.inflight.acquire()
+        try:
+            await self.acquire()
+            started = time.monotonic()
+            try:
+                yield
+            except Exception as exc:
+                self.inflight.record_failure(exc)
+                raise
+            self.inflight.record_success(time.monotonic() - started)
+        finally:
+            await self.inflight.release()
+
 
 class APIRateLimiter:
     """
     Token bucket rate limiter for API endpoints that raises HTTPException when limit is exceeded
     instead of waiting. This provides better user experience for API consumers.
+
+    Uses the same deadline bookkeeping as FirecrawlRateLimiter. acquire()
+    never awaits, so within one event loop its check-and-advance is atomic
+    and no lock is needed. The state is per process: with several API
+    workers each one enforces its own limit (move it to Redis, e.g. INCR
+    with a TTL, if a shared limit is required).
     """
 
     def __init__(self, requests_per_minute: int = 10):
@@ -79,16 +177,27 @@ class APIRateLimiter:
             requests_per_minute: Max requests per minute for API endpoints
         """
         self.rate = requests_per_minute
-        self.tokens = requests_per_minute
         self.max_tokens = requests_per_minute
-        self.last_update = time.time()
-        self.rate_limit_hit_time = None  # Track when rate limit was first exceeded
-        self.lock = asyncio.Lock()
         self.min_interval = 60.0 / requests_per_minute  # Seconds between requests
+        self.burst = (self.max_tokens - 1) * self.min_interval
+        self.next_available = time.monotonic()
+        self.rate_limit_hit_time = None  # Track when rate limit was first exceeded
 
         logger.info(
             f"[APIRateLimiter] Initialized: {self.rate} requests/minute (~{self.min_interval:.2f}s between requests)")
 
+    def _rate_limit_exceeded(self, retry_after: int) -> HTTPException:
+        return HTTPException(
+            status_code=429,
+            detail={
+                "error": "Rate limit exceeded",
+                "message": f"Too many requests. Maximum {self.rate} requests per minute allowed.",
+                "retry_after_seconds": retry_after,
+                "requests_per_minute": self.rate
+            },
+            headers={"Retry-After": str(retry_after)}
+        )
+
     async def acquire(self):
         """
         Check if request can proceed, raise HTTPException if rate limit exceeded
@@ -96,82 +205,58 @@ class APIRateLimiter:
         Raises:
             HTTPException: 429 status code with retry-after header when rate limit is exceeded
         """
-        async with self.lock:
-            now = time.time()
-
-            # Check if rate limit was hit previously and if 60 seconds have passed
-            if self.rate_limit_hit_time is not None:
-                time_since_rate_limit = now - self.rate_limit_hit_time
-
-                # If 60 seconds have passed since rate limit was hit, reset everything
-                if time_since_rate_limit >= 60.0:
-                    logger.info(
-                        f"[APIRateLimiter] Rate limit window expired. Resetting tokens.")
-                    self.tokens = self.max_tokens
-                    self.last_update = now
-                    self.rate_limit_hit_time = None
-                else:
-                    # Still within the rate limit window, reject the request
-                    retry_after = int(60.0 - time_since_rate_limit) + 1
-
-                    logger.warning(
-                        f"[APIRateLimiter] Rate limit still active. Rejecting request. "
-                        f"Retry after {retry_after}s")
-
-                    raise HTTPException(
-                        status_code=429,
-                        detail={
-                            "error": "Rate limit exceeded",
-                            "message": f"Too many requests. Maximum {self.rate} requests per minute allowed.",
-                            "retry_after_seconds": retry_after,
-                            "requests_per_minute": self.rate
-                        },
-                        headers={"Retry-After": str(retry_after)}
-                    )
-
-            # Normal token bucket refill logic
-            time_passed = now - self.last_update
-
-            # Refill tokens based on time passed
-            self.tokens = min(
-                self.max_tokens,
-                self.tokens + time_passed * (self.rate / 60.0)
-            )
-            self.last_update = now
-
-            # Check if tokens available
-            if self.tokens < 1:
-                # Mark when rate limit was first hit
-                self.rate_limit_hit_time = now
-                retry_after = 60  # Always wait for full minute from this point
+        now = time.monotonic()
+
+        # Check if rate limit was hit previously and if 60 seconds have passed
+        if self.rate_limit_hit_time is not None:
+            time_since_rate_limit = now - self.rate_limit_hit_time
+
+            # If 60 seconds have passed since rate limit was hit, reset everything
+            if time_since_rate_limit >= 60.0:
+                logger.info(
+                    f"[APIRateLimiter] Rate limit window expired. Resetting tokens.")
+                self.next_available = now
+                self.rate_limit_hit_time = None
+            else:
+                # Still within the rate limit window, reject the request
+                retry_after = int(60.0 - time_since_rate_limit) + 1
 
                 logger.warning(
-                    f"[APIRateLimiter] Rate limit exceeded. Rejecting request. "
+                    f"[APIRateLimiter] Rate limit still active. Rejecting request. "
                     f"Retry after {retry_after}s")
 
-                raise HTTPException(
-                    status_code=429,
-                    detail={
-                        "error": "Rate limit exceeded",
-                        "message": f"Too many requests. Maximum {self.rate} requests per minute allowed.",
-                        "retry_after_seconds": retry_after,
-                        "requests_per_minute": self.rate
-                    },
-                    headers={"Retry-After": str(retry_after)}
-                )
-
-            # Consume a token
-            self.tokens -= 1
-            remaining_tokens = int(self.tokens)
-            if remaining_tokens <= 2:
-                logger.info(
-                    f"[APIRateLimiter] Low tokens: {remaining_tokens}/{self.max_tokens} remaining")
+                raise self._rate_limit_exceeded(retry_after)
+
+        # Out of tokens once the deadline is more than a full bucket ahead
+        next_available = max(self.next_available, now)
+        if next_available - now > self.burst:
+            # Mark when rate limit was first hit
+            self.rate_limit_hit_time = now
+            retry_after = 60  # Always wait for full minute from this point
+
+            logger.warning(
+                f"[APIRateLimiter] Rate limit exceeded. Rejecting request. "
+                f"Retry after {retry_after}s")
+
+            raise self._rate_limit_exceeded(retry_after)
+
+        # Consume a token
+        self.next_available = next_available + self.min_interval
+        remaining_tokens = int(self.max_tokens - (self.next_available - now) / self.min_interval)
+        if remaining_tokens <= 2:
+            logger.info(
+                f"[APIRateLimiter] Low tokens: {remaining_tokens}/{self.max_tokens} remaining")
 
 
 # Global rate limiter - use centralized config
 FIRECRAWL_RATE_LIMIT = settings.firecrawl_rate_limit
 
-rate_limiter = FirecrawlRateLimiter(requests_per_minute=FIRECRAWL_RATE_LIMIT)
+rate_limiter = FirecrawlRateLimiter(
+    requests_per_minute=FIRECRAWL_RATE_LIMIT,
+    max_concurrent=settings.firecrawl_max_concurrent,
+    min_concurrent=settings.firecrawl_min_concurrent,
+    target_latency=settings.firecrawl_target_latency
+)
 
 rate_limiter_api = APIRateLimiter(requests_per_minute=settings.api_rate_limit)
 
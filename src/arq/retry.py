@@ -0,0 +1,40 @@
+"""
+Retry Helpers - ARQ
+
+ARQ only runs a job again when it raises Retry (any other exception fails
+it for good), and it re-runs it with the same arguments. These helpers work
+out the attempt number from ctx['job_try'] and build the deferred Retry, so
+the worker slot is freed during the backoff instead of sleeping in the task.
+"""
+
+from arq.worker import Retry
+
+# First retry delay in seconds, doubled on every further attempt
+BACKOFF_BASE_S = 60
+
+
+def job_retry_count(ctx, retry_count: int = 0) -> int:
+    """
+    Zero-based attempt number of the running job
+
+    Args:
+        ctx: ARQ context (carries job_try, starting at 1)
+        retry_count: Attempt number passed in by the caller, if any
+
+    Returns:
+        int: The larger of the two
+    """
+    return max(retry_count, ctx.get('job_try', 1) - 1)
+
+
+def retry_with_backoff(retry_count: int) -> Retry:
+    """
+    Retry the job later, backing off exponentially (60s, 120s, 240s, ...)
+
+    Args:
+        retry_count: Zero-based attempt number of the failed run
+
+    Returns:
+        Retry: Exception to raise from the job
+    """
+    return Retry(defer=BACKOFF_BASE_S * 2 ** retry_count)
@@ -1,4 +1,4 @@
-
+import asyncio
 from src.database.core import REDIS_SETTINGS
 from src.config import settings
 from src.arq.extract_events_list import extract_events_list
@@ -8,9 +8,18 @@ from src.arq.get_festivals_details import get_festivals_details
 from src.arq.extract_sports_links_list import extract_sports_links_list
 from src.arq.get_sports_details import get_sports_details
 from src.arq.auto_scrape import auto_scrape
+from src.arq.monitor_firecrawl_credits import monitor_firecrawl_credits
+from src.arq.link_tracking import load_seen_links
+from src.firecrawl.core import close_firecrawl_client
+from src.events.utils import flush_csv_buffers
 from arq import cron
 
 
+async def shutdown(ctx):
+    await close_firecrawl_client()
+    await asyncio.to_thread(flush_csv_buffers)
+
+
 # ARQ Worker Settings
 class WorkerSettings:
     """
@@ -24,6 +33,7 @@ class WorkerSettings:
         get_festivals_details,
         extract_sports_links_list,
         get_sports_details,
+        monitor_firecrawl_credits,    # Credit check (enqueue on demand)
         # batch_scrape_main_links,      # Batch URL scraping (50x faster)
         # batch_scrape_event_details,   # Batch event detail extraction
     ]
@@ -31,6 +41,12 @@ class WorkerSettings:
     # Redis connection settings
     redis_settings = REDIS_SETTINGS
 
+    # Seed the processed-link bloom filters before taking jobs
+    on_startup = load_seen_links
+
+    # Close the shared Firecrawl HTTP client and write out buffered CSV rows when the worker stops
+    on_shutdown = shutdown
+
     # Retry configuration (from config)
     max_tries = settings.arq_max_tries  # Total attempts
     job_timeout = settings.arq_job_timeout  # Max per job
@@ -44,6 +60,7 @@ class WorkerSettings:
     # Worker settings (from config)
     max_jobs = settings.arq_max_jobs  # Number of concurrent jobs
     keep_result = settings.arq_keep_result  # Keep results duration
+    poll_delay = settings.arq_poll_delay  # Queue poll interval (ARQ default: 0.5s)
 
     # Cron jobs (periodic tasks)
     cron_jobs = [
@@ -40,6 +40,7 @@ class WorkerSettings:
     # Worker settings (from config)
     max_jobs = settings.arq_max_jobs  # Number of concurrent jobs
     keep_result = settings.arq_keep_result  # Keep results duration
+    poll_delay = settings.arq_poll_delay  # Queue poll interval (ARQ default: 0.5s)
 
     # Cron jobs (periodic tasks)
     cron_jobs = [
@@ -1,8 +1,11 @@
+from functools import lru_cache
 from pydantic_settings import BaseSettings
 from pydantic import Field
 from typing import Optional
 from dotenv import load_dotenv
 
+# .env wins over the process environment and is also exported to os.environ
+# for libraries that read it directly (firecrawl, arq)
 load_dotenv(override=True)
 
 
@@ -37,11 +40,53 @@ class Settings(BaseSettings):
         default=10, description="FireCrawl API rate limit (requests per minute)")
     firecrawl_timeout: int = Field(
         default=120, description="FireCrawl request timeout in seconds")
+    firecrawl_max_concurrent: int = Field(
+        default=5, description="Max FireCrawl requests in flight per worker")
+    firecrawl_min_concurrent: int = Field(
+        default=1, description="Floor for the adaptive in-flight limit after FireCrawl throttling")
+    firecrawl_target_latency: float = Field(
+        default=60.0, description="Seconds under which a FireCrawl request lets the in-flight limit grow")
+    firecrawl_max_keepalive_connections: int = Field(
+        default=32, description="Idle keep-alive connections kept open to the FireCrawl API")
+    firecrawl_max_connections: int = Field(
+        default=128, description="Max concurrent connections to the FireCrawl API")
+    firecrawl_http2: bool = Field(
+        default=False, description="Talk HTTP/2 to the FireCrawl API (requires the h2 package, httpx[http2])")
+    firecrawl_connect_timeout: float = Field(
+        default=10.0, description="Seconds to wait for a connection to the FireCrawl API")
+    firecrawl_batch_max_size: int = Field(
+        default=16, description="Max concurrent single-URL scrapes coalesced into one batch_scrape call")
+    firecrawl_batch_max_wait_ms: int = Field(
+        default=50, description="How long (ms) to wait for more URLs before sending a batch")
+    firecrawl_batch_max_queue: int = Field(
+        default=128, description="Max URLs waiting in a batcher before new submissions are rejected")
+    firecrawl_batch_page_concurrency: int = Field(
+        default=4, description="Pages FireCrawl scrapes at once within a batch job (sizes how long a batch may run)")
+    firecrawl_cache_ttl: int = Field(
+        default=21600, description="Seconds to cache successful FireCrawl scrape results in Redis (0 disables)")
+    firecrawl_credits_cache_ttl: float = Field(
+        default=30.0, description="Seconds to reuse a fetched FireCrawl credit usage response (0 disables)")
 
     # Redis settings
     redis_url: str = Field(..., description="Redis connection URL")
     redis_max_connections: int = Field(
-        default=10, description="Redis max connections in pool")
+        default=50, description="Redis max connections in the sync (API) pool")
+    redis_async_max_connections: int = Field(
+        default=64, description="Redis max connections in the async pool used by ARQ tasks")
+    redis_pool_timeout: int = Field(
+        default=20, description="Seconds to wait for a free pooled Redis connection before erroring")
+    link_bloom_capacity: int = Field(
+        default=1_000_000, description="Links each worker-side bloom filter is sized for (per link type)")
+    link_bloom_error_rate: float = Field(
+        default=1e-4, description="False positive rate of the worker-side link bloom filters")
+    redis_bloom_processed_links: bool = Field(
+        default=False, description="Track processed links in RedisBloom filters instead of sets (needs the RedisBloom module)")
+    redis_bloom_capacity: int = Field(
+        default=1_000_000, description="Links each RedisBloom processed-links filter is reserved for")
+    redis_bloom_error_rate: float = Field(
+        default=0.001, description="False positive rate of the RedisBloom processed-links filters")
+    redis_bloom_expansion: int = Field(
+        default=2, description="Growth factor of a RedisBloom filter once it reaches capacity")
 
     # ARQ (Background Jobs) settings
     arq_max_jobs: int = Field(
@@ -52,6 +97,8 @@ class Settings(BaseSettings):
         default=600, description="Job timeout in seconds (10 minutes)")
     arq_keep_result: int = Field(
         default=3600, description="Keep job results for N seconds (1 hour)")
+    arq_poll_delay: float = Field(
+        default=0.1, description="Seconds between ARQ queue polls when the worker is idle")
 
     # Scraping settings
     scrape_timeout_initial: int = Field(
@@ -138,5 +185,16 @@ class Settings(BaseSettings):
         extra = "ignore"
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Build the settings once per process
+
+    Returns:
+        Settings: The shared settings instance
+    """
+    return Settings()
+
+
 # Global settings instance
-settings = Settings()
+settings = get_settings()
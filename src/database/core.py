@@ -1,17 +1,32 @@
 from src.config import settings
 import redis
+import redis.asyncio
 from arq.connections import RedisSettings
 
 # Use centralized config
 redis_url = settings.redis_url
 
-# Create Redis client with connection pooling
-redis_client = redis.from_url(
+# Create Redis client with connection pooling. Blocking pools make callers wait
+# for a free connection instead of failing with "Too many connections", and
+# keepalive stops idle pooled connections (and their TLS sessions) being dropped.
+redis_pool = redis.BlockingConnectionPool.from_url(
     redis_url,
     max_connections=settings.redis_max_connections,
+    timeout=settings.redis_pool_timeout,
+    socket_keepalive=True,
     decode_responses=False  # Set to True if you want automatic string decoding
 )
+redis_client = redis.Redis(connection_pool=redis_pool)
 
+# Shared async connection pool for ARQ tasks (hiredis parser is used automatically when installed)
+redis_async_pool = redis.asyncio.BlockingConnectionPool.from_url(
+    redis_url,
+    max_connections=settings.redis_async_max_connections,
+    timeout=settings.redis_pool_timeout,
+    socket_keepalive=True,
+    decode_responses=False
+)
+redis_async = redis.asyncio.Redis(connection_pool=redis_async_pool)
 
 # ARQ Redis settings
 REDIS_SETTINGS = RedisSettings.from_dsn(redis_url)
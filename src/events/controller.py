@@ -1,7 +1,5 @@
 from fastapi import APIRouter, UploadFile, File, Depends
-from src.events.schemas import (ExtractEventDetailsFromMultipleMainUrlsBody,
-                                ExtractEventDetailsFromSingleMainUrlBody)
-from .service import extract_event_details_from_event_links, get_all_events, extract_event_details_from_single_link, extract_event_details_from_csv_file
+from .service import get_all_events, extract_event_details_from_csv_file
 from src.arq.rate_limiter import rate_limit_dependency
 
 
@@ -72,7 +70,7 @@ async def get_extracted_events(limit: int = 10, offset: int = 0):
     Returns:
         dict: List of extracted events with pagination info
     """
-    return get_all_events(limit=limit, offset=offset)
+    return await get_all_events(limit=limit, offset=offset)
 
 
 # @eventRouter.post("/batch")
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 
 
@@ -67,6 +67,14 @@ class EventDetailsSchema(BaseModel):
     )
 
 
+class StoredEvent(BaseModel):
+    """Minimum an extracted event needs before it is stored (other fields pass through)"""
+    model_config = ConfigDict(extra='allow')
+
+    title: str = Field(..., min_length=1)
+    event_link: str = Field(..., min_length=1)
+
+
 class FestivalDetail(BaseModel):
     """Schema for individual festival details"""
     title: str = Field(..., description="The title of the festival.")
@@ -218,3 +226,11 @@ EVENT_DETAILS_SCHEMA = {
         }
     }
 }
+
+
+# JSON schemas for Firecrawl's json format, built once at import so the SDK
+# doesn't regenerate them from the pydantic models on every request
+MAIN_LINK_JSON_SCHEMA = MainLinkSchema.model_json_schema()
+EVENT_DETAILS_JSON_SCHEMA = EventDetailsSchema.model_json_schema()
+FESTIVALS_DETAILS_JSON_SCHEMA = FestivalsDetailsSchema.model_json_schema()
+SPORTS_DETAILS_JSON_SCHEMA = SportsDetailsSchema.model_json_schema()
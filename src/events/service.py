@@ -1,8 +1,11 @@
-import json
+import orjson
+from urllib.parse import urlsplit, urlunsplit
 from fastapi import HTTPException, UploadFile, File
-from src.arq.enqueqe_job import enqueue_job
+from src.arq.enqueqe_job import enqueue_job, enqueue_jobs
+from src.arq.link_tracking import link_job_id
 from src.logging import logger
-from src.database.core import redis_client
+from src.config import settings
+from src.database.core import redis_async
 from .utils import parse_urls_by_type_from_csv, save_uploaded_file
 
 
@@ -24,10 +27,18 @@ async def extract_event_details_from_csv_file(file: UploadFile = File(...)):
         )
 
     try:
-        # Define uploads directory
-        await save_uploaded_file(file)
+        # Read the upload once: the same bytes are saved and parsed
+        contents = await file.read()
 
-        res = await parse_urls_by_type_from_csv(file)
+        # Fail fast before touching disk: nothing to parse, or not text at all
+        if not contents.strip():
+            raise ValueError("CSV file is empty")
+        if b"\x00" in contents[:1024]:
+            raise ValueError("Uploaded file is not a text CSV file")
+
+        # Parse before saving so a bad upload doesn't replace the auto-scrape CSV
+        res = await parse_urls_by_type_from_csv(contents)
+        await save_uploaded_file(contents)
 
         if res["success"]:
             if len(res["events_list"]) > 0:
@@ -68,23 +79,45 @@ async def extract_event_details_from_single_link(url: str):
     }
 
 
+def _normalize_url(url: str) -> str:
+    """
+    Strip whitespace and lowercase the scheme and host (paths are case sensitive)
+    """
+    parts = urlsplit(url.strip())
+    return urlunsplit(parts._replace(scheme=parts.scheme.lower(), netloc=parts.netloc.lower()))
+
+
+async def _enqueue_links(job_type: str, urls: list[str]):
+    """
+    Queue a job per unique URL, skipping URLs whose job is still queued or running
+
+    Returns:
+        list: (url, Job) pairs for the URLs that were queued
+    """
+    urls = list(dict.fromkeys(_normalize_url(url) for url in urls if url and url.strip()))
+    jobs = await enqueue_jobs(
+        job_type, [(link,) for link in urls],
+        job_ids=[link_job_id(job_type, link) for link in urls])
+    return [(link, job) for link, job in zip(urls, jobs) if job is not None]
+
+
 async def extract_events_details_from_links(urls: list[str], job_type: str):
 
     if not urls:
         return {"error": "No URLs provided", "status": "failed"}
 
+    # Queue every new URL for scraping in pipelined round trips
+    queued = await _enqueue_links(job_type, urls)
     job_ids = []
-    for link in urls:
-        # Queue each URL for scraping
-        job = await enqueue_job(job_type, link)
+    for link, job in queued:
         job_ids.append(str(job.job_id))
-        logger.info(f"Queued scraping job for: {link} (Job ID: {job.job_id})")
+        logger.debug("Queued scraping job for: %s (Job ID: %s)", link, job.job_id)
 
     return {
         "status": "queued",
         "method": "single",
-        "message": f"Successfully queued {len(urls)} URLs for scraping (single URL method)",
-        "urls_queued": len(urls),
+        "message": f"Successfully queued {len(queued)} URLs for scraping (single URL method)",
+        "urls_queued": len(queued),
         "job_ids": job_ids
     }
 
@@ -111,26 +144,30 @@ async def extract_event_details_from_event_links(urls: list[str]):
     if not urls:
         return {"error": "No URLs provided", "status": "failed"}
 
+    # Queue every new URL for scraping in pipelined round trips
+    queued = await _enqueue_links('extract_events_list', urls)
     job_ids = []
-    for link in urls:
-        # Queue each URL for scraping
-        job = await enqueue_job('extract_events_list', link)
+    for link, job in queued:
         job_ids.append(str(job.job_id))
-        logger.info(f"Queued scraping job for: {link} (Job ID: {job.job_id})")
+        logger.debug("Queued scraping job for: %s (Job ID: %s)", link, job.job_id)
 
     return {
         "status": "queued",
         "method": "single",
-        "message": f"Successfully queued {len(urls)} URLs for scraping (single URL method)",
-        "urls_queued": len(urls),
+        "message": f"Successfully queued {len(queued)} URLs for scraping (single URL method)",
+        "urls_queued": len(queued),
         "job_ids": job_ids
     }
 
 
-def get_all_events(limit: int, offset: int):
+async def get_all_events(limit: int, offset: int):
     """
     Get extracted event details from Redis
 
+    Entries in the events list are written by the ARQ tasks after
+    validation, so they are only decoded here, never validated again (use
+    model_construct, not the model constructor, if typed objects are needed).
+
     Args:
         limit: Number of events to return (default: 10)
         offset: Offset for pagination (default: 0)
@@ -139,20 +176,25 @@ def get_all_events(limit: int, offset: int):
         dict: List of extracted events
     """
 
-    # Get events from Redis list
-    events_data = redis_client.lrange(
-        'events_details', offset, offset + limit - 1)
-
-    events = []
-    for event_str in events_data:
-        try:
-            event = json.loads(event_str)
-            events.append(event)
-        except json.JSONDecodeError as e:
-            logger.error(f"Error decoding event data: {e}")
-            continue
+    # Read the page and the list length in one round trip
+    async with redis_async.pipeline(transaction=False) as pipe:
+        pipe.lrange(settings.redis_events_detail_key, offset, offset + limit - 1)
+        pipe.llen(settings.redis_events_detail_key)
+        events_data, total_count = await pipe.execute()
 
-    total_count = redis_client.llen('events_details')
+    # Entries are raw JSON bytes, so decode the whole page as one array in a
+    # single orjson call; only fall back to one by one if an entry is corrupt
+    try:
+        events = orjson.loads(b"[" + b",".join(events_data) + b"]")
+    except orjson.JSONDecodeError:
+        events = None
+    if events is None or len(events) != len(events_data):
+        events = []
+        for event_str in events_data:
+            try:
+                events.append(orjson.loads(event_str))
+            except orjson.JSONDecodeError as e:
+                logger.error(f"Error decoding event data: {e}")
 
     return {
         "total": total_count,
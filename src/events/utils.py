@@ -1,97 +1,180 @@
+import asyncio
+import atexit
+import csv
 from pathlib import Path
 from pydantic import BaseModel
-import shutil
-from typing import Dict, Any, List
-import json
-import pandas as pd
-from fastapi import UploadFile, File
+import threading
+from typing import Dict, Any, List, Optional
+import orjson
+from fastapi import UploadFile
 
 from src.logging import logger
 
+# pandas / numpy are imported inside the CSV parsing functions only: the ARQ
+# workers import this module for the CSV writers, which never need them
+
+# ARQ tasks write CSVs from worker threads; guards the row buffers and appends
+_csv_write_lock = threading.Lock()
+
+# Rows waiting to be appended, per CSV file: (columns, rows). Tasks flush
+# their file before returning; a buffer is only dropped once it is written.
+_csv_buffers: Dict[Path, tuple] = {}
+_CSV_BUFFER_MAX = 500
+
+# Accepted names for the URL and Type columns of a links CSV, in priority order
+_URL_COLUMNS = ('Base URL', 'url', 'website', 'link', 'URL', 'Website URL', 'Link')
+_TYPE_COLUMNS = ('Type', 'type')
+
+# Rows parsed per chunk when splitting a links CSV by type
+_CSV_CHUNK_ROWS = 50_000
+
+# Accepted URL prefixes (one startswith call checks both)
+_URL_SCHEMES = ('http://', 'https://')
+
+# Directories already created for CSV output
+_csv_dirs = set()
+
+# Field mapping: normalize inconsistent field names from scraper to schema
+_FESTIVAL_FIELD_MAP = {
+    'address': 'address_line_1',
+    'province/state': 'province_state',
+    'postal/zip code': 'postal_zip_code',
+    'latitude': 'lat',
+    'longitude': 'lng',
+    'contact email': 'contact_email',
+    'contact website': 'contact_website',
+    'contact primary phone': 'contact_primary_phone',
+}
+_EVENT_FIELD_MAP = {**_FESTIVAL_FIELD_MAP, 'time slots': 'time_slots'}
+
+# Column order matching the EventDetail / FestivalDetail schemas
+_COLUMNS_EVENTS = (
+    'title', 'description', 'event_link', 'price', 'display_photo',
+    'photos', 'time_zone', 'hosts', 'sponsors', 'address_line_1',
+    'city', 'province_state', 'postal_zip_code', 'country',
+    'lat', 'lng', 'contact_email', 'contact_website',
+    'contact_primary_phone', 'time_slots'
+)
+_COLUMNS_FESTIVALS = (
+    'title', 'description', 'event_link', 'price', 'display_photo',
+    'photos', 'time_zone', 'hosts', 'sponsors', 'address_line_1',
+    'city', 'province_state', 'postal_zip_code', 'country',
+    'lat', 'lng', 'contact_email', 'contact_website',
+    'contact_primary_phone', 'start_date', 'end_date'
+)
+
+# List fields stored as JSON strings
+_JSON_FIELDS_EVENTS = ('photos', 'hosts', 'sponsors', 'time_slots')
+_JSON_FIELDS_FESTIVALS = ('photos', 'hosts', 'sponsors')
+
+
+def _normalize_event(event: Dict[str, Any], field_mapping: Dict[str, str], json_fields: tuple) -> Dict[str, Any]:
+    """Return a copy of the event with schema field names and list fields as JSON strings"""
+    event = {field_mapping.get(key, key): value for key, value in event.items()}
+
+    for field in json_fields:
+        value = event.get(field)
+        if type(value) is list:
+            event[field] = orjson.dumps(value).decode()
+    return event
+
+
+def _csv_cell(value):
+    """Missing values (None / NaN) become empty cells, like pandas.to_csv"""
+    if value is None or value != value:
+        return ''
+    return value
+
+
+def _append_csv_rows(csv_path: Path, columns: tuple, events: List[Dict[str, Any]]):
+    """
+    Buffer events as rows in the given column order. The buffer for a file is
+    written out once it holds _CSV_BUFFER_MAX rows, and by flush_csv_buffers
+    (at the end of each task and on shutdown).
+    """
+    rows = [[_csv_cell(event.get(col)) for col in columns] for event in events]
+
+    with _csv_write_lock:
+        buffer = _csv_buffers.get(csv_path)
+        if buffer is None:
+            buffer = _csv_buffers[csv_path] = (columns, [])
+        buffer[1].extend(rows)
+        if len(buffer[1]) >= _CSV_BUFFER_MAX:
+            _try_flush_csv_buffer(csv_path)
+
+
+def _flush_csv_buffer(csv_path: Path):
+    """
+    Append a file's buffered rows with one open, writing the header first if
+    the file is new or empty. The buffer is removed only once the write
+    succeeds. Caller holds _csv_write_lock.
+    """
+    columns, rows = _csv_buffers[csv_path]
+    if rows:
+        if csv_path.parent not in _csv_dirs:
+            csv_path.parent.mkdir(parents=True, exist_ok=True)
+            _csv_dirs.add(csv_path.parent)
+
+        with csv_path.open('a', newline='', encoding='utf-8', buffering=1 << 20) as fh:
+            created = fh.tell() == 0
+            writer = csv.writer(fh)
+            if created:
+                writer.writerow(columns)
+            writer.writerows(rows)
+
+        if created:
+            logger.info(f"[CSV] Created new CSV file with headers: {csv_path}")
+        logger.info(f"[CSV] Appended {len(rows)} row(s) to: {csv_path}")
+
+    del _csv_buffers[csv_path]
+
+
+def _try_flush_csv_buffer(csv_path: Path):
+    """
+    Flush a file's buffer, keeping the rows for the next flush if the write
+    fails (the error is logged, not raised into whichever task triggered it)
+    """
+    try:
+        _flush_csv_buffer(csv_path)
+    except Exception as e:
+        logger.error(
+            f"[CSV] Error writing to CSV file {csv_path}, keeping "
+            f"{len(_csv_buffers[csv_path][1])} row(s) buffered: {e}")
+
+
+def flush_csv_buffers(csv_file_path: Optional[str] = None):
+    """
+    Write out buffered CSV rows (called at the end of each detail task, on
+    worker shutdown and at exit)
+
+    Args:
+        csv_file_path: Only flush this file (default: every buffered file)
+    """
+    with _csv_write_lock:
+        paths = [Path(csv_file_path)] if csv_file_path else list(_csv_buffers)
+        for csv_path in paths:
+            if csv_path in _csv_buffers:
+                _try_flush_csv_buffer(csv_path)
+
+
+atexit.register(flush_csv_buffers)
+
 
 def write_events_to_csv(event: Dict[str, Any], csv_file_path: str):
     """
-    Write events to CSV file using pandas with a single header row.
+    Append an event to a CSV file with a single header row.
     Creates the file with headers if it doesn't exist, otherwise appends data.
+    Rows are buffered until the task calls flush_csv_buffers.
 
     Args:
-        events: List of event dictionaries to write
+        event: Event dictionary to write
         csv_file_path: Path to the CSV file
     """
 
     try:
-        # Ensure the directory exists
-        csv_path = Path(csv_file_path)
-        csv_path.parent.mkdir(parents=True, exist_ok=True)
-
-        # Field mapping: normalize inconsistent field names from scraper to schema
-        field_mapping = {
-            'address': 'address_line_1',
-            'province/state': 'province_state',
-            'postal/zip code': 'postal_zip_code',
-            'latitude': 'lat',
-            'longitude': 'lng',
-            'contact email': 'contact_email',
-            'contact website': 'contact_website',
-            'contact primary phone': 'contact_primary_phone',
-            'time slots': 'time_slots'
-        }
+        event = _normalize_event(event, _EVENT_FIELD_MAP, _JSON_FIELDS_EVENTS)
 
-        # Convert list fields to JSON strings for CSV storage and normalize field names
-        events_processed = []
-        # for event in events:
-        # event_copy = event.copy()
-
-        # Normalize field names
-        for old_name, new_name in field_mapping.items():
-            if old_name in event:
-                event[new_name] = event.pop(old_name)
-
-            # Convert list fields to JSON strings
-        for field in ['photos', 'hosts', 'sponsors', 'time_slots']:
-            if field in event and isinstance(event[field], list):
-                event[field] = json.dumps(event[field])
-
-        events_processed.append(event)
-
-        # Create DataFrame from events
-        df = pd.DataFrame(events_processed)
-
-        # Define the column order matching EventDetail schema
-        columns = [
-            'title', 'description', 'event_link', 'price', 'display_photo',
-            'photos', 'time_zone', 'hosts', 'sponsors', 'address_line_1',
-            'city', 'province_state', 'postal_zip_code', 'country',
-            'lat', 'lng', 'contact_email', 'contact_website',
-            'contact_primary_phone', 'time_slots'
-        ]
-
-        # Ensure all columns exist in the DataFrame (add missing ones with empty values)
-        for col in columns:
-            if col not in df.columns:
-                df[col] = ''
-
-        # Reorder columns to match the schema
-        df = df[columns]
-
-        # Check if file exists
-        file_exists = csv_path.exists()
-
-        # Write to CSV (append mode if file exists, otherwise create new)
-        df.to_csv(
-            csv_file_path,
-            mode='a' if file_exists else 'w',
-            header=not file_exists,
-            index=False,
-            encoding='utf-8'
-        )
-
-        if not file_exists:
-            logger.info(
-                f"[CSV] Created new CSV file with headers: {csv_file_path}")
-        else:
-            logger.info(
-                f"[CSV] Appended event to: {csv_file_path}")
+        _append_csv_rows(Path(csv_file_path), _COLUMNS_EVENTS, [event])
 
     except Exception as e:
         logger.error(f"[CSV] Error writing to CSV file {csv_file_path}: {e}")
@@ -100,94 +183,48 @@ def write_events_to_csv(event: Dict[str, Any], csv_file_path: str):
 
 def write_festivals_to_csv(event: Dict[str, Any], csv_file_path: str):
     """
-    Write events to CSV file using pandas with a single header row.
+    Write a single festival to CSV file (see write_festivals_to_csv_many).
+
+    Args:
+        event: Festival dictionary to write
+        csv_file_path: Path to the CSV file
+    """
+    write_festivals_to_csv_many([event], csv_file_path)
+
+
+def write_festivals_to_csv_many(events: List[Dict[str, Any]], csv_file_path: str):
+    """
+    Append festivals to a CSV file with a single header row.
     Creates the file with headers if it doesn't exist, otherwise appends data.
+    Rows are buffered until the task calls flush_csv_buffers.
 
     Args:
-        events: List of event dictionaries to write
+        events: List of festival dictionaries to write
         csv_file_path: Path to the CSV file
     """
 
-    try:
-        # Ensure the directory exists
-        csv_path = Path(csv_file_path)
-        csv_path.parent.mkdir(parents=True, exist_ok=True)
-
-        # Field mapping: normalize inconsistent field names from scraper to schema
-        field_mapping = {
-            'address': 'address_line_1',
-            'province/state': 'province_state',
-            'postal/zip code': 'postal_zip_code',
-            'latitude': 'lat',
-            'longitude': 'lng',
-            'contact email': 'contact_email',
-            'contact website': 'contact_website',
-            'contact primary phone': 'contact_primary_phone',
-            # 'time slots': 'time_slots'
-        }
+    if not events:
+        return
 
-        # Convert list fields to JSON strings for CSV storage and normalize field names
-        events_processed = []
-        # for event in events:
-        # event_copy = event.copy()
-
-        # Normalize field names
-        for old_name, new_name in field_mapping.items():
-            if old_name in event:
-                event[new_name] = event.pop(old_name)
-
-            # Convert list fields to JSON strings
-        for field in ['photos', 'hosts', 'sponsors']:
-            if field in event and isinstance(event[field], list):
-                event[field] = json.dumps(event[field])
-
-        events_processed.append(event)
-
-        # Create DataFrame from events
-        df = pd.DataFrame(events_processed)
-
-        # Define the column order matching EventDetail schema
-        columns = [
-            'title', 'description', 'event_link', 'price', 'display_photo',
-            'photos', 'time_zone', 'hosts', 'sponsors', 'address_line_1',
-            'city', 'province_state', 'postal_zip_code', 'country',
-            'lat', 'lng', 'contact_email', 'contact_website',
-            'contact_primary_phone', 'start_date', 'end_date'
-        ]
-
-        # Ensure all columns exist in the DataFrame (add missing ones with empty values)
-        for col in columns:
-            if col not in df.columns:
-                df[col] = ''
-
-        # Reorder columns to match the schema
-        df = df[columns]
-
-        # Check if file exists
-        file_exists = csv_path.exists()
-
-        # Write to CSV (append mode if file exists, otherwise create new)
-        df.to_csv(
-            csv_file_path,
-            mode='a' if file_exists else 'w',
-            header=not file_exists,
-            index=False,
-            encoding='utf-8'
-        )
+    try:
+        events = [
+            _normalize_event(event, _FESTIVAL_FIELD_MAP, _JSON_FIELDS_FESTIVALS) for event in events]
 
-        if not file_exists:
-            logger.info(
-                f"[CSV] Created new CSV file with headers: {csv_file_path}")
-        else:
-            logger.info(
-                f"[CSV] Appended event to: {csv_file_path}")
+        _append_csv_rows(Path(csv_file_path), _COLUMNS_FESTIVALS, events)
 
     except Exception as e:
         logger.error(f"[CSV] Error writing to CSV file {csv_file_path}: {e}")
         raise
 
 
-async def save_uploaded_file(file: UploadFile = File(...), filename: str = "links.csv"):
+async def save_uploaded_file(contents: bytes, filename: str = "links.csv"):
+    """
+    Save the uploaded CSV bytes to uploads/ (read back later by auto-scrape)
+
+    Args:
+        contents: Uploaded file content, already read once by the caller
+        filename: Name to save under (overwrites an existing file)
+    """
     uploads_dir = Path("uploads")
     uploads_dir.mkdir(exist_ok=True)
 
@@ -195,14 +232,10 @@ async def save_uploaded_file(file: UploadFile = File(...), filename: str = "link
     file_path = uploads_dir / filename
 
     # Save the uploaded file locally
-    with file_path.open("wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    await asyncio.to_thread(file_path.write_bytes, contents)
 
     logger.info(f"CSV file saved locally as: {file_path}")
 
-    # Reset file pointer to beginning for further processing
-    await file.seek(0)
-
 
 async def parse_urls_from_csv(file: UploadFile) -> List[str]:
     """
@@ -222,6 +255,8 @@ async def parse_urls_from_csv(file: UploadFile) -> List[str]:
     Raises:
         ValueError: If CSV is invalid or contains no URLs
     """
+    import pandas as pd
+
     try:
         # Read the uploaded file content
         contents = await file.read()
@@ -263,7 +298,7 @@ async def parse_urls_from_csv(file: UploadFile) -> List[str]:
         # Basic URL validation
         valid_urls = []
         for url in urls:
-            if url.startswith('http://') or url.startswith('https://'):
+            if url.startswith(_URL_SCHEMES):
                 valid_urls.append(url)
             else:
                 logger.warning(f"[CSV] Skipping invalid URL: {url}")
@@ -283,6 +318,103 @@ async def parse_urls_from_csv(file: UploadFile) -> List[str]:
         raise ValueError(f"Failed to parse CSV file: {str(e)}")
 
 
+def _read_url_type_columns(open_source):
+    """
+    Read only the URL and Type columns of a links CSV.
+
+    The header is parsed first to pick the columns; the body is then parsed
+    with usecols so other columns are never converted or stored, and in
+    chunks of _CSV_CHUNK_ROWS rows so a large file is never one DataFrame.
+
+    Args:
+        open_source: Callable returning a fresh path or buffer for pd.read_csv
+
+    Returns:
+        tuple: (chunks, url_column, type_column), chunks being a reader of
+            DataFrames. If either column is missing its name is None and
+            chunks is the header-only DataFrame instead.
+    """
+    import pandas as pd
+
+    header = pd.read_csv(open_source(), nrows=0)
+
+    columns = set(header.columns)
+    url_column = next((col for col in _URL_COLUMNS if col in columns), None)
+    type_column = next((col for col in _TYPE_COLUMNS if col in columns), None)
+    if url_column is None or type_column is None:
+        return header, url_column, type_column
+
+    chunks = pd.read_csv(open_source(), usecols=[url_column, type_column], dtype='string',
+                         chunksize=_CSV_CHUNK_ROWS)
+    return chunks, url_column, type_column
+
+
+def _split_urls_by_type(chunks, url_column: str, type_column: str, log_prefix: str):
+    """
+    Split the URL column into event, festival and sport lists by the Type
+    column, one chunk at a time (see _split_chunk_by_type).
+
+    Returns:
+        tuple: (events_list, festivals_list, sports_list)
+    """
+    events_list, festivals_list, sports_list = [], [], []
+    with chunks:
+        for df in chunks:
+            events, festivals, sports = _split_chunk_by_type(
+                df, url_column, type_column, log_prefix)
+            events_list += events
+            festivals_list += festivals
+            sports_list += sports
+    return events_list, festivals_list, sports_list
+
+
+# URL list a Type value sorts into: the first keyword found in it decides
+_URL_TYPE_KEYWORDS = ('event', 'festival', 'sport')
+_UNKNOWN_TYPE = len(_URL_TYPE_KEYWORDS)
+_MISSING_TYPE = -1
+
+
+def _url_type_bucket(url_type: str) -> int:
+    """Index into _URL_TYPE_KEYWORDS for a normalized Type value, or _UNKNOWN_TYPE"""
+    return next((i for i, keyword in enumerate(_URL_TYPE_KEYWORDS) if keyword in url_type), _UNKNOWN_TYPE)
+
+
+def _split_chunk_by_type(df, url_column: str, type_column: str, log_prefix: str):
+    """
+    Split a chunk's URL column into event, festival and sport lists by the Type column.
+
+    Rows missing either value are skipped, URLs must start with http:// or
+    https://, and the first of 'event', 'festival', 'sport' found in the
+    (lowercased) type decides the list. The Type column only has a handful of
+    distinct values, so it is read as a Categorical and each category is
+    matched once; rows are then sorted by their category code.
+
+    Returns:
+        tuple: (events_list, festivals_list, sports_list)
+    """
+    import numpy as np
+
+    urls = df[url_column].astype('string').str.strip()
+    types = df[type_column].astype('category')
+
+    names = [str(name).strip().lower() for name in types.cat.categories]
+    codes = types.cat.codes.to_numpy()
+    # Code -1 (missing type) picks the trailing _MISSING_TYPE
+    buckets = np.array([_url_type_bucket(name) for name in names] + [_MISSING_TYPE])[codes]
+
+    present = urls.notna().to_numpy() & (buckets != _MISSING_TYPE)
+    valid = present & urls.str.startswith(_URL_SCHEMES).fillna(False).to_numpy()
+    for url in urls[present & ~valid]:
+        logger.warning(f"{log_prefix} Skipping invalid URL: {url}")
+
+    unknown = valid & (buckets == _UNKNOWN_TYPE)
+    for url, code in zip(urls[unknown], codes[unknown]):
+        logger.warning(
+            f"[CSV] Unknown type '{names[code]}' for URL: {url}, skipping")
+
+    return tuple(urls[valid & (buckets == bucket)].tolist() for bucket in range(len(_URL_TYPE_KEYWORDS)))
+
+
 class TypeFromCSVResponse(BaseModel):
     events_list: List[str]
     festivals_list: List[str]
@@ -290,7 +422,7 @@ class TypeFromCSVResponse(BaseModel):
     success: bool
 
 
-async def parse_urls_by_type_from_csv(file: UploadFile) -> TypeFromCSVResponse:
+async def parse_urls_by_type_from_csv(contents: bytes) -> TypeFromCSVResponse:
     """
     Parse URLs from uploaded CSV file and group them by type.
 
@@ -299,7 +431,7 @@ async def parse_urls_by_type_from_csv(file: UploadFile) -> TypeFromCSVResponse:
     - 'Type (event | festival | sport)': The type of content
 
     Args:
-        file: Uploaded CSV file from FastAPI
+        contents: Uploaded CSV file content
 
     Returns:
         Dict[str, List[str]]: Dictionary with keys 'events_list', 'festivals_list', 'sports_list'
@@ -308,32 +440,16 @@ async def parse_urls_by_type_from_csv(file: UploadFile) -> TypeFromCSVResponse:
     Raises:
         ValueError: If CSV is invalid, missing required columns, or contains no valid URLs
     """
+    import pandas as pd
+
     try:
-        # Read the uploaded file content
-        contents = await file.read()
-        # print('contents', contents)
-        # Read CSV with pandas
+        # Find the URL and Type columns from the header, then parse only those
         try:
-            df = pd.read_csv(pd.io.common.BytesIO(contents))
+            chunks, url_column, type_column = _read_url_type_columns(
+                lambda: pd.io.common.BytesIO(contents))
         except Exception as e:
             raise ValueError(f"Failed to read CSV file: {str(e)}")
 
-        # Check for required columns
-        url_column = None
-        type_column = None
-
-        # Find URL column
-        for col_name in ['Base URL', 'url', 'website', 'link', 'URL', 'Website URL', 'Link']:
-            if col_name in df.columns:
-                url_column = col_name  # Website URL
-                break
-
-        # Find Type column
-        for col_name in ['Type', 'type']:
-            if col_name in df.columns:
-                type_column = col_name  # Type
-                break
-
         if url_column is None:
             raise ValueError(
                 "CSV must contain a URL column (e.g., 'Base URL', 'url', 'website')")
@@ -345,38 +461,8 @@ async def parse_urls_by_type_from_csv(file: UploadFile) -> TypeFromCSVResponse:
         logger.info(
             f"[CSV] Using URL column: {url_column}, Type column: {type_column}")
 
-        # Initialize result dictionaries
-        events_list = []
-        festivals_list = []
-        sports_list = []
-
-        # Process each row
-        for _, row in df.iterrows():
-            url = row.get(url_column)
-            url_type = row.get(type_column)
-
-            # Skip if URL or type is missing/empty
-            if pd.isna(url) or pd.isna(url_type):
-                continue
-
-            url = str(url).strip()
-            url_type = str(url_type).strip().lower()
-
-            # Validate URL format
-            if not (url.startswith('http://') or url.startswith('https://')):
-                logger.warning(f"[CSV] Skipping invalid URL: {url}")
-                continue
-
-            # Categorize by type
-            if 'event' in url_type:
-                events_list.append(url)
-            elif 'festival' in url_type:
-                festivals_list.append(url)
-            elif 'sport' in url_type:
-                sports_list.append(url)
-            else:
-                logger.warning(
-                    f"[CSV] Unknown type '{url_type}' for URL: {url}, skipping")
+        events_list, festivals_list, sports_list = _split_urls_by_type(
+            chunks, url_column, type_column, log_prefix="[CSV]")
 
         # Create result dictionary
         result = {
@@ -408,10 +494,47 @@ async def parse_urls_by_type_from_csv(file: UploadFile) -> TypeFromCSVResponse:
         raise ValueError(f"Failed to parse CSV file: {str(e)}")
 
 
+def _split_csv_rows_by_type(rows, url_index: int, type_index: int, log_prefix: str):
+    """
+    Split csv.reader rows into event, festival and sport URL lists, with the
+    same rules as _split_chunk_by_type. Each distinct Type value is matched
+    once and then looked up.
+
+    Returns:
+        tuple: (events_list, festivals_list, sports_list)
+    """
+    lists = tuple([] for _ in _URL_TYPE_KEYWORDS)
+    type_buckets = {}
+    last_index = max(url_index, type_index)
+
+    for row in rows:
+        if len(row) <= last_index or not row[url_index] or not row[type_index]:
+            continue
+
+        url = row[url_index].strip()
+        if not url.startswith(_URL_SCHEMES):
+            logger.warning(f"{log_prefix} Skipping invalid URL: {url}")
+            continue
+
+        url_type = row[type_index]
+        bucket = type_buckets.get(url_type)
+        if bucket is None:
+            bucket = type_buckets[url_type] = _url_type_bucket(url_type.strip().lower())
+        if bucket == _UNKNOWN_TYPE:
+            logger.warning(
+                f"[CSV] Unknown type '{url_type.strip().lower()}' for URL: {url}, skipping")
+            continue
+        lists[bucket].append(url)
+
+    return lists
+
+
 async def process_csv_file(file_path: str):
     """
     Process CSV file from local filesystem and extract URLs by type.
 
+    Read row by row with the csv module, so the ARQ worker never loads pandas.
+
     Args:
         file_path: Path to the CSV file
 
@@ -431,65 +554,31 @@ async def process_csv_file(file_path: str):
                 "error": "CSV file not found"
             }
 
-        # Read CSV file
-        df = pd.read_csv(csv_path)
-
-        # Find URL and Type columns
-        url_column = None
-        type_column = None
-
-        for col_name in ['Base URL', 'url', 'website', 'link', 'URL', 'Website URL', 'Link']:
-            if col_name in df.columns:
-                url_column = col_name
-                break
-
-        for col_name in ['Type', 'type']:
-            if col_name in df.columns:
-                type_column = col_name
-                break
-
-        if url_column is None or type_column is None:
-            logger.error(
-                f"[Auto-Scrape] CSV missing required columns. Found: {df.columns.tolist()}")
-            return {
-                "events_list": [],
-                "festivals_list": [],
-                "sports_list": [],
-                "success": False,
-                "error": "Missing required columns (URL and Type)"
-            }
-
-        # Initialize result lists
-        events_list = []
-        festivals_list = []
-        sports_list = []
-
-        # Process each row
-        for _, row in df.iterrows():
-            url = row.get(url_column)
-            url_type = row.get(type_column)
-
-            if pd.isna(url) or pd.isna(url_type):
-                continue
-
-            url = str(url).strip()
-            url_type = str(url_type).strip().lower()
-
-            # Validate URL format
-            if not (url.startswith('http://') or url.startswith('https://')):
-                logger.warning(f"[Auto-Scrape] Skipping invalid URL: {url}")
-                continue
-
-            # Categorize by type
-            if 'event' in url_type:
-                events_list.append(url)
-            elif 'festival' in url_type:
-                festivals_list.append(url)
-            elif 'sport' in url_type:
-                sports_list.append(url)
-            else:
-                logger.warning(
-                    f"[CSV] Unknown type '{url_type}' for URL: {url}, skipping")
+        with csv_path.open(newline='', encoding='utf-8-sig', buffering=1 << 20) as fh:
+            reader = csv.reader(fh)
+            header = next(reader, None)
+            if header is None:
+                raise ValueError("CSV file is empty")
+
+            # Find the URL and Type columns from the header
+            columns = set(header)
+            url_column = next((col for col in _URL_COLUMNS if col in columns), None)
+            type_column = next((col for col in _TYPE_COLUMNS if col in columns), None)
+
+            if url_column is None or type_column is None:
+                logger.error(
+                    f"[Auto-Scrape] CSV missing required columns. Found: {header}")
+                return {
+                    "events_list": [],
+                    "festivals_list": [],
+                    "sports_list": [],
+                    "success": False,
+                    "error": "Missing required columns (URL and Type)"
+                }
+
+            events_list, festivals_list, sports_list = _split_csv_rows_by_type(
+                reader, header.index(url_column), header.index(type_column),
+                log_prefix="[Auto-Scrape]")
 
         total_urls = len(events_list) + len(festivals_list) + len(sports_list)
         logger.info(
@@ -504,8 +593,6 @@ async def process_csv_file(file_path: str):
             "success": True
         }
 
-    except pd.errors.EmptyDataError:
-        raise ValueError("CSV file is empty")
     except ValueError:
         raise
     except Exception as e:
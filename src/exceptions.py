@@ -1,3 +1,4 @@
+import re
 from fastapi import HTTPException
 
 
@@ -21,15 +22,28 @@ class FirecrawlTimeoutError(FirecrawlError):
     pass
 
 
+# Error message keywords and the exception each one maps to (matched in one
+# pass; a timeout still wins over a rate limit, which wins over a credit issue)
+_ERROR_KEYWORDS_RE = re.compile(r"timeout|timed out|rate limit|credit|insufficient", re.IGNORECASE)
+_ERROR_KEYWORD_KINDS = {
+    "timeout": FirecrawlTimeoutError,
+    "timed out": FirecrawlTimeoutError,
+    "rate limit": FirecrawlRateLimitError,
+    "credit": FirecrawlCreditError,
+    "insufficient": FirecrawlCreditError,
+}
+
+
 def handle_firecrawl_error(exc):
     """Helper to categorize and handle Firecrawl errors"""
     error_msg = str(exc)
+    kinds = {_ERROR_KEYWORD_KINDS[match.lower()] for match in _ERROR_KEYWORDS_RE.findall(error_msg)}
 
-    if "timeout" in error_msg.lower() or "timed out" in error_msg.lower():
+    if FirecrawlTimeoutError in kinds:
         raise FirecrawlTimeoutError(f"Request timeout: {error_msg}")
-    elif "rate limit" in error_msg.lower():
+    elif FirecrawlRateLimitError in kinds:
         raise FirecrawlRateLimitError(f"Rate limit exceeded: {error_msg}")
-    elif "credit" in error_msg.lower() or "insufficient" in error_msg.lower():
+    elif FirecrawlCreditError in kinds:
         raise FirecrawlCreditError(f"Credit issue: {error_msg}")
     else:
         raise FirecrawlError(f"Firecrawl API error: {error_msg}")
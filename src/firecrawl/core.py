@@ -1,4 +1,7 @@
+import socket
+import httpx
 from firecrawl import Firecrawl, AsyncFirecrawl
+from firecrawl.v2.utils.http_client_async import AsyncHttpClient
 from src.config import settings
 
 
@@ -14,3 +17,67 @@ firecrawl_async = AsyncFirecrawl(
     api_key=firecrawl_api_key,
     # api_url=settings.firecrawl_base_url
 )
+
+
+class _SharedAsyncHttpClient(AsyncHttpClient):
+    """
+    SDK HTTP client backed by a given httpx client. The SDK passes
+    timeout=None on every call unless told otherwise, which would turn off
+    the client's timeouts; None here means "use the client default".
+    """
+
+    def __init__(self, api_key: str, api_url: str, client: httpx.AsyncClient):
+        self.api_key = api_key
+        self.api_url = api_url
+        self._client = client
+
+    async def post(self, endpoint, data, headers=None, timeout=None):
+        return await super().post(endpoint, data, headers, _client_timeout(timeout))
+
+    async def get(self, endpoint, headers=None, timeout=None):
+        return await super().get(endpoint, headers, _client_timeout(timeout))
+
+    async def delete(self, endpoint, headers=None, timeout=None):
+        return await super().delete(endpoint, headers, _client_timeout(timeout))
+
+
+def _client_timeout(timeout):
+    return httpx.USE_CLIENT_DEFAULT if timeout is None else timeout
+
+
+# The SDK builds its async httpx client with keep-alive disabled, so every
+# request pays a fresh TCP + TLS handshake. Swap in one shared client that
+# keeps connections open (optionally multiplexed over HTTP/2); AsyncFirecrawl
+# has no option to pass a client in. Direct API calls (credit usage) reuse it.
+_sdk_api_url = firecrawl_async._v2_client.async_http_client.api_url
+firecrawl_http = httpx.AsyncClient(
+    base_url=_sdk_api_url,
+    headers={
+        "Authorization": f"Bearer {firecrawl_api_key}",
+        "Content-Type": "application/json",
+    },
+    transport=httpx.AsyncHTTPTransport(
+        limits=httpx.Limits(
+            max_keepalive_connections=settings.firecrawl_max_keepalive_connections,
+            max_connections=settings.firecrawl_max_connections,
+        ),
+        http2=settings.firecrawl_http2,
+        # Keep idle pooled sockets alive and don't delay small request writes
+        socket_options=[
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+            (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+        ],
+    ),
+    # Fail fast on connect; reads may take as long as a scrape job
+    timeout=httpx.Timeout(
+        settings.arq_job_timeout, connect=settings.firecrawl_connect_timeout),
+)
+_sdk_http = _SharedAsyncHttpClient(firecrawl_api_key, _sdk_api_url, firecrawl_http)
+firecrawl_async._v2_client.async_http_client = _sdk_http
+
+
+async def close_firecrawl_client():
+    """
+    Close the shared Firecrawl HTTP client (called on shutdown)
+    """
+    await _sdk_http.close()
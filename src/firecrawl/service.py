@@ -1,16 +1,40 @@
-from src.database.core import redis_client
+import asyncio
+import time
+from redis.exceptions import ResponseError
+from src.database.core import redis_async
+from src.arq.link_tracking import processed_bloom_key
 from src.logging import logger
 from src.config import settings
-from src.firecrawl.core import firecrawl_api_key
+from src.firecrawl.core import firecrawl_http
 
 
 async def queue_stats():
-  # Get queue statistics
-    pending_links = redis_client.scard('event_links_queue')
-    processed_links = redis_client.scard('processed_event_links')
-    failed_main_links = redis_client.scard('failed_event_links')
-    failed_detail_links = redis_client.scard('failed_event_detail_links')
-    total_events = redis_client.llen('events_details')
+  # Get queue statistics in one round trip
+    processed_key = settings.redis_processed_event_links_key
+    bloom_key = processed_bloom_key(processed_key)
+    async with redis_async.pipeline(transaction=False) as pipe:
+        pipe.scard(settings.redis_event_links_queue_key)
+        pipe.scard(processed_key)
+        pipe.scard(settings.redis_failed_event_main_links_key)
+        pipe.scard(settings.redis_failed_event_detail_links_key)
+        pipe.llen(settings.redis_events_detail_key)
+        if settings.redis_bloom_processed_links:
+            pipe.exists(bloom_key)
+            pipe.bf().card(bloom_key)
+        # A missing RedisBloom module must not fail the other counters
+        results = await pipe.execute(raise_on_error=False)
+    for result in results[:5]:
+        if isinstance(result, Exception):
+            raise result
+    (pending_links, processed_links, failed_main_links,
+     failed_detail_links, total_events) = results[:5]
+
+    # With RedisBloom enabled, processed links are only added to the filter
+    # (the set keeps whatever was there before), so count the filter instead
+    if settings.redis_bloom_processed_links:
+        bloom_exists, bloom_count = results[5:]
+        if bloom_exists and not isinstance(bloom_count, ResponseError):
+            processed_links = bloom_count
 
     return {
         "queue": {
@@ -25,20 +49,48 @@ async def queue_stats():
     }
 
 
+# Last successful credit usage response: (fetched at, data). Concurrent
+# requests wait on the lock so only one of them calls Firecrawl.
+_credits_cache = (0.0, None)
+_credits_lock = asyncio.Lock()
+
+
+def _cached_credits():
+    fetched_at, data = _credits_cache
+    if data is not None and time.monotonic() - fetched_at < settings.firecrawl_credits_cache_ttl:
+        return data
+    return None
+
+
 async def get_firecrawl_credits():
-    import httpx
+    """
+    Fetch the team's credit usage from Firecrawl, reusing a successful
+    response for firecrawl_credits_cache_ttl seconds.
 
+    Returns:
+        dict: Credit usage data, or {"success": False, ...} on failure
+    """
+    data = _cached_credits()
+    if data is not None:
+        return data
+
+    async with _credits_lock:
+        data = _cached_credits()
+        if data is None:
+            data = await _fetch_firecrawl_credits()
+        return data
+
+
+async def _fetch_firecrawl_credits():
+    global _credits_cache
     try:
+        # Shared keep-alive client (already carries the Authorization header)
         url = f"{settings.firecrawl_base_url}/v2/team/credit-usage"
-        headers = {
-            "Authorization": f"Bearer {firecrawl_api_key}"
-        }
-
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers, timeout=10)
+        response = await firecrawl_http.get(url, timeout=10)
 
         if response.status_code == 200:
             data = response.json()
+            _credits_cache = (time.monotonic(), data)
 
             return data
 
@@ -1,8 +1,12 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from src.events.controller import eventRouter
 from src.firecrawl.controller import firecrawlRouter
+from src.arq.enqueqe_job import close_pool
+from src.firecrawl.core import close_firecrawl_client
 
-app = FastAPI()
+# orjson (already a dependency) encodes the larger event listings much faster
+app = FastAPI(default_response_class=ORJSONResponse)
 
 
 app.include_router(eventRouter, prefix='/api')
@@ -10,6 +14,12 @@ app.include_router(eventRouter, prefix='/api')
 app.include_router(firecrawlRouter, prefix='/api')
 
 
+@app.on_event("shutdown")
+async def shutdown():
+    await close_pool()
+    await close_firecrawl_client()
+
+
 @app.get("/")
 async def root():
     return {"message": "Hello World"}